@@ -9,6 +9,15 @@ from core.config_loader import load_config, ConfigValidationError
 
 logger = logging.getLogger(__name__)
 
+# Prefer the LibYAML C loader when available (much faster on large configs)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed config shared by read-only callers: {path: ((mtime_ns, size), data)}
+_yaml_cache: Dict[str, tuple] = {}
+
 
 class ConfigManager:
     """Helper class to manage config.yaml"""
@@ -21,6 +30,26 @@ class ConfigManager:
         with open(self.config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
 
+    def _load_yaml_cached(self) -> Dict:
+        """
+        Load config.yaml as dict, reusing the last parse while the file is unchanged
+
+        The returned dict is shared between callers and must not be mutated;
+        use _load_yaml() when the data will be modified and saved.
+        """
+        key = str(self.config_path)
+        st = self.config_path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+
+        cached = _yaml_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+        _yaml_cache[key] = (signature, data)
+        return data
+
     def _save_yaml(self, data: Dict):
         """Save dict to config.yaml"""
         with open(self.config_path, 'w', encoding='utf-8') as f:
@@ -1,35 +1,219 @@
 """
 Scraper Manager - Manage scraping processes with intelligent batching
 """
+import io
 import os
+import sys
+import copy
+import heapq
 import json
+import pickle
+import queue
 import subprocess
+import multiprocessing
 import threading
 import time
+import traceback
 import yaml
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+from api.helpers.config_manager import ConfigManager
+
 try:
     import psutil
     HAS_PSUTIL = True
 except ImportError:
     HAS_PSUTIL = False
 
+# orjson is optional; fall back to stdlib json with the same bytes interface
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    _loads = json.loads
+
+# Prefer the LibYAML C loader when available (much faster on large configs)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
+class _TailStream(io.TextIOBase):
+    """Writable text stream that keeps only the most recent complete lines"""
+
+    def __init__(self, maxlen: int = 50):
+        super().__init__()
+        self.lines = deque(maxlen=maxlen)
+        self._partial = ''
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            lines = (self._partial + text).split('\n')
+            self._partial = lines.pop()
+            self.lines.extend(lines)
+        return len(text)
+
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self._partial = ''
+
+    def tail(self) -> str:
+        with self._lock:
+            lines = list(self.lines)
+            if self._partial:
+                lines.append(self._partial)
+        return '\n'.join(lines)
+
+
+def _drain_to_tail(stream, tail: deque):
+    """Read a text stream line by line into a bounded deque until EOF"""
+    try:
+        for line in stream:
+            tail.append(line.rstrip('\n'))
+    finally:
+        stream.close()
+
+
+def _batch_worker_main(env: Dict, task_queue, result_queue):
+    """
+    Entry point of a long-lived batch worker process
+
+    Imports main.py once (config load + heavy scraper imports) and then runs
+    each batch of site keys received on task_queue until a None sentinel.
+    The worker's stdout and stderr are captured so each result carries the
+    tail of its batch's output, as with a `python main.py` subprocess.
+    """
+    os.environ.clear()
+    os.environ.update(env)
+
+    stdout_tail = _TailStream()
+    stderr_tail = _TailStream()
+    sys.stdout = stdout_tail
+    sys.stderr = stderr_tail
+
+    try:
+        import main as scraper_main
+        import_error = None
+    except BaseException as e:  # main.py calls sys.exit() on config errors
+        scraper_main = None
+        import_error = f"Failed to load scraper: {e!r}"
+
+    while True:
+        batch_sites = task_queue.get()
+        if batch_sites is None:
+            break
+
+        stdout_tail.clear()
+        stderr_tail.clear()
+        return_code, error = 0, import_error
+        if scraper_main is None:
+            return_code = 1
+        else:
+            try:
+                scraper_main.main(sites=batch_sites)
+            except SystemExit as e:
+                # Same status a `python main.py` subprocess would exit with
+                return_code = 0 if e.code is None else (e.code if isinstance(e.code, int) else 1)
+            except Exception as e:
+                traceback.print_exc()
+                return_code, error = 1, str(e)
+
+        result = {
+            'success': return_code == 0,
+            'return_code': return_code,
+            'sites': batch_sites,
+            'stdout': stdout_tail.tail()[-1000:],
+            'stderr': stderr_tail.tail()[-1000:]
+        }
+        if error:
+            result['error'] = error
+        result_queue.put(result)
+
+
+# Workers are spawned, never forked: the API server is multi-threaded and
+# holds live Firestore gRPC channels, neither of which survives a fork
+_worker_context = multiprocessing.get_context('spawn')
+
+
+class _BatchWorker:
+    """Handle to one persistent batch worker process and its queues"""
+
+    def __init__(self, env: Dict):
+        self.task_queue = _worker_context.Queue()
+        self.result_queue = _worker_context.Queue()
+        self.process = _worker_context.Process(
+            target=_batch_worker_main,
+            args=(env, self.task_queue, self.result_queue),
+            daemon=True
+        )
+        self.process.start()
+        logger.info(f"Started batch worker (pid {self.process.pid})")
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, batch_sites: List[str]) -> Dict:
+        """Run one batch and wait for its result, failing if the worker dies"""
+        self.task_queue.put(list(batch_sites))
+        while True:
+            try:
+                return self.result_queue.get(timeout=1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"Batch worker exited with code {self.process.exitcode}")
+
+    def close(self, timeout: float = 10):
+        """Shut the worker down, terminating it if it does not exit in time"""
+        if self.process.is_alive():
+            try:
+                self.task_queue.put(None)
+            except Exception:
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+
+
 class ScraperManager:
     """Helper class to manage scraping processes with intelligent batching"""
 
     def __init__(self):
         self.state_file = Path("logs/scraper_state.json")
         self.metadata_file = Path("logs/site_metadata.json")
-        self.progress_file = Path("logs/batch_progress.json")
+        # Progress is machine-only bookkeeping, so it is pickled rather than JSON
+        self.progress_file = Path("logs/batch_progress.pkl")
         self.config_file = Path("config.yaml")
+        self._config_manager = None
         self.current_process = None
+        # Pause between starting consecutive batches
+        self.batch_delay_seconds = 5
+        # Persistent batch workers: all live workers, and those free for a batch
+        self._workers = []
+        self._idle_workers = []
+        self._worker_lock = threading.Lock()
+        # Running `python main.py` batch processes (RP_BATCH_WORKER=0)
+        self._batch_processes = set()
         self.process_lock = threading.Lock()
         self.batch_stats = {
             'total_time': 0,
@@ -37,6 +221,27 @@ class ScraperManager:
             'failed_sites': [],
             'retry_count': 0
         }
+        # Run control signals set directly by pause/resume/stop so the batch
+        # thread observes them without a state file round-trip; requests
+        # served by other API worker processes arrive via the state file
+        self._pause_event = threading.Event()
+        self._stop_event = threading.Event()
+        # Last parsed state file keyed by (mtime_ns, size) to skip re-parsing
+        self._state_cache = {'mtime_ns': None, 'size': None, 'data': None}
+        # get_history result keyed by state/metadata file signatures and limit
+        self._history_cache = {'key': None, 'result': None}
+        # Running site totals for the current run (avoids recounting progress)
+        self._counts = {'completed': 0, 'failed': 0}
+        # Recent (monotonic_time, completed_count) samples for rolling ETA
+        self._eta_buffer = deque(maxlen=10)
+        # Seed non-blocking CPU sampling; later calls report usage since the last one
+        self._proc = None
+        if HAS_PSUTIL:
+            try:
+                self._proc = psutil.Process()
+                self._proc.cpu_percent(interval=None)
+            except Exception as e:
+                logger.error(f"Error initializing resource monitoring: {e}")
 
     def _load_state(self) -> Dict:
         """Load current scraper state"""
@@ -48,8 +253,15 @@ class ScraperManager:
             }
 
         try:
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            st = os.stat(self.state_file)
+            cache = self._state_cache
+            if (st.st_mtime_ns, st.st_size) == (cache['mtime_ns'], cache['size']):
+                return copy.deepcopy(cache['data'])
+
+            raw = self.state_file.read_bytes()
+            data = _loads(raw)
+            self._state_cache = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'data': data}
+            return copy.deepcopy(data)
         except Exception as e:
             logger.error(f"Error loading state: {e}")
             return {
@@ -58,23 +270,37 @@ class ScraperManager:
                 'last_run': None
             }
 
+    def _atomic_write(self, path: Path, content: bytes):
+        """Write content to a temp file and rename it over path"""
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
     def _save_state(self, state: Dict):
         """Save scraper state"""
         try:
-            os.makedirs(self.state_file.parent, exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self._atomic_write(self.state_file, _dumps(state))
         except Exception as e:
             logger.error(f"Error saving state: {e}")
 
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[tuple]:
+        """(mtime_ns, size) of a file, or None if it does not exist"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def _load_metadata(self) -> Dict:
         """Load site metadata"""
         if not self.metadata_file.exists():
             return {}
 
         try:
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
+            return _loads(self.metadata_file.read_bytes())
         except Exception as e:
             logger.error(f"Error loading metadata: {e}")
             return {}
@@ -82,28 +308,123 @@ class ScraperManager:
     def _save_progress(self, progress: Dict):
         """Save real-time progress data"""
         try:
-            os.makedirs(self.progress_file.parent, exist_ok=True)
-            with open(self.progress_file, 'w') as f:
-                json.dump(progress, f, indent=2)
+            self._atomic_write(self.progress_file, pickle.dumps(progress, protocol=5))
         except Exception as e:
             logger.error(f"Error saving progress: {e}")
 
+    def _merge_persisted_controls(self, state: Dict, run_id: str,
+                                  pause_event: threading.Event) -> bool:
+        """
+        Merge pause/resume/stop requests persisted in the state file into state
+
+        With several API worker processes (gunicorn -w N), pause_scrape,
+        resume_scrape and stop_scrape may be served by a process other than
+        the one running the batches; the state file is the only way their
+        requests reach this run. The persisted paused flag and timestamps
+        are copied into state['current_run'] and drive pause_event. Call
+        with process_lock held so a pause/resume in this process cannot
+        interleave with the re-read.
+
+        Returns:
+            False if the persisted state shows the run stopped or replaced by
+            another run, in which case state must not be written back
+        """
+        current_run = state.get('current_run')
+        if not self.state_file.exists():
+            if current_run is not None:
+                current_run['paused'] = pause_event.is_set()
+            return True
+
+        persisted = self._load_state()
+        persisted_run = persisted.get('current_run') or {}
+        if not persisted.get('is_running', False) or persisted_run.get('run_id') != run_id:
+            return False
+
+        if current_run is not None:
+            for key in ('paused', 'paused_at', 'resumed_at'):
+                if key in persisted_run:
+                    current_run[key] = persisted_run[key]
+            if current_run.get('paused', False):
+                pause_event.set()
+            else:
+                pause_event.clear()
+        return True
+
+    def _flush(self, state: Dict, progress_data: Dict, run_id: str,
+               pause_event: threading.Event) -> bool:
+        """
+        Persist in-memory run state and progress (sets of site keys)
+
+        Persisted run controls are merged in first, under process_lock so a
+        pause/resume/stop cannot land between the re-read and the write.
+        Returns False, writing nothing, if the run was stopped from another
+        process.
+        """
+        with self.process_lock:
+            if not self._merge_persisted_controls(state, run_id, pause_event):
+                return False
+            self._save_progress({key: sorted(sites) for key, sites in progress_data.items()})
+            self._save_state(state)
+        return True
+
+    def _stop_from_state_file(self, stop_event: threading.Event):
+        """Halt this run after another process persisted a stop"""
+        logger.info("Scraper stopped by another API worker")
+        stop_event.set()
+        self._kill_batches()
+
     def _load_progress(self) -> Dict:
         """Load real-time progress data"""
         if not self.progress_file.exists():
             return {}
         try:
-            with open(self.progress_file, 'r') as f:
-                return json.load(f)
+            return pickle.loads(self.progress_file.read_bytes())
         except Exception as e:
             logger.error(f"Error loading progress: {e}")
             return {}
 
-    def _get_site_priority(self, site_key: str, config_data: Dict) -> int:
-        """Get priority for a site (lower number = higher priority)"""
-        site_config = config_data.get('sites', {}).get(site_key, {})
-        metadata = site_config.get('metadata', {})
-        return metadata.get('priority', 999)  # Default to low priority
+    def _filter_fresh_sites(self, sites: List[str], config_data: Dict) -> tuple:
+        """
+        Drop sites whose last successful scrape is still within their TTL
+
+        TTL comes from the site's `metadata.ttl_seconds` in config.yaml, falling
+        back to RP_SCRAPE_TTL_SECONDS (default 0 = always scrape). Only
+        applied when scraping all enabled sites; explicitly requested sites
+        are always scraped.
+
+        Returns:
+            (sites_to_scrape, skipped_sites)
+        """
+        try:
+            default_ttl = int(os.environ.get('RP_SCRAPE_TTL_SECONDS', 0))
+        except ValueError:
+            default_ttl = 0
+
+        site_configs = (config_data or {}).get('sites', {})
+        metadata = None
+        now = datetime.now()
+        to_scrape, skipped = [], []
+
+        for site_key in sites:
+            site_meta = (site_configs.get(site_key) or {}).get('metadata') or {}
+            ttl = site_meta.get('ttl_seconds', default_ttl)
+            if not ttl:
+                to_scrape.append(site_key)
+                continue
+
+            if metadata is None:
+                metadata = self._load_metadata()
+            last_scrape = metadata.get(site_key, {}).get('last_successful_scrape')
+            try:
+                fresh = (now - datetime.fromisoformat(last_scrape)).total_seconds() < ttl
+            except (TypeError, ValueError):
+                fresh = False
+
+            (skipped if fresh else to_scrape).append(site_key)
+
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} recently scraped sites: {skipped}")
+        return to_scrape, skipped
 
     def _calculate_optimal_batch_size(self, total_sites: int) -> int:
         """Calculate optimal batch size based on site count and environment"""
@@ -125,13 +446,22 @@ class ScraperManager:
         else:
             return 20
 
-    def _split_into_batches(self, sites: List[str], batch_size: int = None) -> List[List[str]]:
+    def _get_batch_parallelism(self, env: Dict) -> int:
+        """Number of batches to run concurrently (RP_BATCH_PARALLELISM, default 1)"""
+        try:
+            return max(1, int(env.get('RP_BATCH_PARALLELISM', 1)))
+        except ValueError:
+            return 1
+
+    def _split_into_batches(self, sites: List[str], batch_size: int = None,
+                            config_data: Dict = None) -> List[List[str]]:
         """
         Split sites into optimal batches with priority sorting
 
         Args:
             sites: List of site keys to scrape
             batch_size: Override automatic batch sizing
+            config_data: Already-parsed config (loaded from disk if omitted)
 
         Returns:
             List of batches (each batch is a list of site keys)
@@ -140,18 +470,20 @@ class ScraperManager:
             return []
 
         # Load config to get priorities
-        try:
-            with open(self.config_file, 'r') as f:
-                config_data = yaml.safe_load(f)
-        except Exception as e:
-            logger.warning(f"Could not load config for priority sorting: {e}")
-            config_data = {}
+        if config_data is None:
+            try:
+                with open(self.config_file, 'r') as f:
+                    config_data = yaml.load(f, Loader=_YamlLoader)
+            except Exception as e:
+                logger.warning(f"Could not load config for priority sorting: {e}")
+                config_data = {}
 
-        # Sort sites by priority (lower number = higher priority = scraped first)
-        sorted_sites = sorted(
-            sites,
-            key=lambda s: self._get_site_priority(s, config_data)
-        )
+        # Build priority map once (lower number = higher priority = scraped first)
+        priorities = {
+            site_key: (site_config or {}).get('metadata', {}).get('priority', 999)
+            for site_key, site_config in (config_data or {}).get('sites', {}).items()
+        }
+        sorted_sites = sorted(sites, key=lambda s: priorities.get(s, 999))
 
         # Calculate batch size if not provided
         if batch_size is None:
@@ -168,14 +500,13 @@ class ScraperManager:
 
     def _get_resource_usage(self) -> Dict:
         """Get current system resource usage"""
-        if not HAS_PSUTIL:
+        if self._proc is None:
             return {'memory_percent': 0, 'cpu_percent': 0}
 
         try:
-            process = psutil.Process()
             return {
-                'memory_percent': round(process.memory_percent(), 1),
-                'cpu_percent': round(process.cpu_percent(interval=0.1), 1)
+                'memory_percent': round(self._proc.memory_percent(), 1),
+                'cpu_percent': round(self._proc.cpu_percent(interval=None), 1)
             }
         except Exception as e:
             logger.error(f"Error getting resource usage: {e}")
@@ -190,7 +521,15 @@ class ScraperManager:
                 'average_seconds_per_site': None
             }
 
+        # Prefer the rate over the recent sample window; it tracks changes in
+        # site speed better than the cumulative average
         avg_time = elapsed_seconds / completed_sites
+        if len(self._eta_buffer) >= 2:
+            first_ts, first_count = self._eta_buffer[0]
+            last_ts, last_count = self._eta_buffer[-1]
+            if last_count > first_count and last_ts > first_ts:
+                avg_time = (last_ts - first_ts) / (last_count - first_count)
+
         remaining_sites = total_sites - completed_sites
         remaining_seconds = int(avg_time * remaining_sites)
 
@@ -204,7 +543,7 @@ class ScraperManager:
 
     def _update_batch_progress(self, state: Dict, batch_num: int, total_batches: int,
                               batch_sites: List[str], status: str = 'in_progress'):
-        """Update real-time batch progress in state"""
+        """Update real-time batch progress in state (in memory, caller flushes)"""
         current_run = state.get('current_run', {})
 
         # Update batch info
@@ -216,9 +555,8 @@ class ScraperManager:
         }
 
         # Calculate progress
-        progress_data = self._load_progress()
-        completed_sites = len(progress_data.get('completed', []))
-        failed_sites = len(progress_data.get('failed', []))
+        completed_sites = self._counts['completed']
+        failed_sites = self._counts['failed']
         total_sites = len(current_run.get('sites', []))
 
         current_run['progress'] = {
@@ -242,48 +580,142 @@ class ScraperManager:
         # Add resource usage
         current_run['resources'] = self._get_resource_usage()
 
-        # Save updated state
-        self._save_state(state)
-
-    def _execute_single_batch(self, batch_sites: List[str], env: Dict, config_manager) -> Dict:
+    def _acquire_worker(self, env: Dict) -> _BatchWorker:
+        """Take an idle batch worker, starting a new one if none is free"""
+        with self._worker_lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker
+                self._workers.remove(worker)
+
+            worker = _BatchWorker(env)
+            self._workers.append(worker)
+            return worker
+
+    def _release_worker(self, worker: _BatchWorker):
+        """Return a worker to the idle pool (dead workers are dropped)"""
+        with self._worker_lock:
+            if worker not in self._workers:
+                return  # already shut down by _stop_workers
+            if worker.is_alive():
+                self._idle_workers.append(worker)
+            else:
+                self._workers.remove(worker)
+
+    def _stop_workers(self, timeout: float = 10):
+        """Shut down all batch workers"""
+        with self._worker_lock:
+            workers = self._workers
+            self._workers = []
+            self._idle_workers = []
+
+        for worker in workers:
+            worker.close(timeout)
+
+    def _kill_batches(self):
+        """Kill this process's batch workers and any in-flight batch processes"""
+        self._stop_workers(timeout=0)
+        for process in list(self._batch_processes):
+            process.kill()
+
+    def _execute_single_batch(self, batch_sites: List[str], env: Dict) -> Dict:
         """
         Execute a single batch of sites
 
+        Batches run in persistent worker processes that import main.py once
+        per run. Set RP_BATCH_WORKER=0 to run each batch as a separate
+        `python main.py` subprocess instead.
+
         Args:
             batch_sites: List of site keys for this batch
             env: Environment variables
-            config_manager: ConfigManager instance
 
         Returns:
             Dict with success status and details
         """
+        logger.info(f"Executing batch with sites: {batch_sites}")
+
+        if env.get('RP_BATCH_WORKER', '1') == '0':
+            return self._execute_batch_subprocess(batch_sites, env)
+
         try:
-            # Enable only this batch's sites
-            data = config_manager._load_yaml()
-            for site_key in data.get('sites', {}).keys():
-                data['sites'][site_key]['enabled'] = site_key in batch_sites
-            config_manager._save_yaml(data)
+            # Reuse an idle worker, or start one (first batch, or previous died)
+            worker = self._acquire_worker(env)
+            try:
+                result = worker.run(batch_sites)
+            finally:
+                self._release_worker(worker)
+
+            if not result['success']:
+                logger.error(f"Batch failed with return code {result['return_code']}")
+                if result.get('error'):
+                    logger.error(f"Error: {result['error'][:500]}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error executing batch: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'sites': batch_sites
+            }
+
+    def _execute_batch_subprocess(self, batch_sites: List[str], env: Dict) -> Dict:
+        """
+        Execute a single batch as a separate main.py process
 
-            logger.info(f"Executing batch with sites: {batch_sites}")
+        The batch's sites are passed to main.py via RP_ENABLED_SITES rather
+        than by rewriting the enabled flags in config.yaml.
+
+        Args:
+            batch_sites: List of site keys for this batch
+            env: Environment variables
+
+        Returns:
+            Dict with success status and details
+        """
+        try:
+            # Enable only this batch's sites
+            batch_env = dict(env)
+            batch_env['RP_ENABLED_SITES'] = ','.join(batch_sites)
 
             # Run main.py for this batch
             process = subprocess.Popen(
                 ['python', 'main.py'],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                env=env,
+                env=batch_env,
                 text=True
             )
+            self.current_process = process
+            self._batch_processes.add(process)
+
+            # Stream output into bounded tails rather than buffering it all
+            stdout_tail = deque(maxlen=50)
+            stderr_tail = deque(maxlen=50)
+            readers = [
+                threading.Thread(target=_drain_to_tail, args=(process.stdout, stdout_tail), daemon=True),
+                threading.Thread(target=_drain_to_tail, args=(process.stderr, stderr_tail), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
 
             # Wait for completion
-            stdout, stderr = process.communicate()
+            process.wait()
+            self._batch_processes.discard(process)
+            for reader in readers:
+                reader.join()
 
+            stdout = '\n'.join(stdout_tail)
+            stderr = '\n'.join(stderr_tail)
             success = process.returncode == 0
 
             if not success:
                 logger.error(f"Batch failed with return code {process.returncode}")
                 if stderr:
-                    logger.error(f"Stderr: {stderr[:500]}")
+                    logger.error(f"Stderr: {stderr[-500:]}")
 
             return {
                 'success': success,
@@ -330,11 +762,12 @@ class ScraperManager:
                 env['RP_GEOCODE'] = '1' if geocoding else '0'
 
             # Determine which sites to scrape
-            from api.helpers.config_manager import ConfigManager
-            config_manager = ConfigManager()
+            if self._config_manager is None:
+                self._config_manager = ConfigManager()
+            config_manager = self._config_manager
 
             try:
-                data = config_manager._load_yaml()
+                data = config_manager._load_yaml_cached()
 
                 if sites:
                     # Use specified sites
@@ -352,10 +785,22 @@ class ScraperManager:
                         'error': 'No sites to scrape (none enabled or specified)'
                     }
 
+                # Skip sites scraped within their TTL, unless they were
+                # requested explicitly
+                skipped_sites = []
+                if not sites:
+                    target_sites, skipped_sites = self._filter_fresh_sites(target_sites, data)
+                if not target_sites:
+                    return {
+                        'success': False,
+                        'error': 'No sites to scrape (all scraped recently)',
+                        'skipped': skipped_sites
+                    }
+
                 logger.info(f"Starting scrape for {len(target_sites)} sites")
 
                 # Split into batches
-                batches = self._split_into_batches(target_sites)
+                batches = self._split_into_batches(target_sites, config_data=data)
                 total_batches = len(batches)
 
                 logger.info(f"Split into {total_batches} batches")
@@ -366,6 +811,7 @@ class ScraperManager:
                     'run_id': run_id,
                     'started_at': datetime.now().isoformat(),
                     'sites': target_sites,
+                    'skipped': skipped_sites,
                     'max_pages': max_pages,
                     'geocoding': geocoding,
                     'batch_info': {
@@ -383,6 +829,10 @@ class ScraperManager:
                     }
                 }
 
+                self._pause_event = threading.Event()
+                self._stop_event = threading.Event()
+                self._counts = {'completed': 0, 'failed': 0}
+                self._eta_buffer = deque([(time.monotonic(), 0)], maxlen=10)
                 state = {
                     'is_running': True,
                     'current_run': current_run,
@@ -401,7 +851,7 @@ class ScraperManager:
                 # Start batch execution in background thread
                 execution_thread = threading.Thread(
                     target=self._execute_batches,
-                    args=(batches, env, config_manager, run_id, state)
+                    args=(batches, env, run_id, state, progress_data)
                 )
                 execution_thread.daemon = True
                 execution_thread.start()
@@ -428,117 +878,205 @@ class ScraperManager:
                     'error': str(e)
                 }
 
-    def _execute_batches(self, batches: List[List[str]], env: Dict, config_manager, run_id: str, state: Dict):
+    def _run_batch_with_retry(self, batch_num: int, total_batches: int, batch_sites: List[str],
+                              env: Dict, stop_event: threading.Event) -> Optional[Dict]:
+        """
+        Execute a batch, retrying once after 30 seconds if it fails
+
+        Returns:
+            Result of the last attempt, or None if stopped before the retry
+        """
+        result = self._execute_single_batch(batch_sites, env)
+        if result['success']:
+            logger.info(f"Batch {batch_num}/{total_batches} completed successfully")
+            return result
+
+        # Retry logic - one retry per batch
+        logger.warning(f"Batch {batch_num}/{total_batches} failed, retrying in 30 seconds...")
+        if stop_event.wait(timeout=30):
+            logger.info(f"Scraper stopped before retrying batch {batch_num}/{total_batches}")
+            return None
+
+        retry_result = self._execute_single_batch(batch_sites, env)
+        if retry_result['success']:
+            logger.info(f"Batch {batch_num}/{total_batches} succeeded on retry")
+        else:
+            logger.error(f"Batch {batch_num}/{total_batches} failed after retry")
+        return retry_result
+
+    def _execute_batches(self, batches: List[List[str]], env: Dict, run_id: str,
+                         state: Dict, progress_data: Dict):
         """
-        Execute all batches sequentially with retry logic
+        Execute all batches with retry logic
+
+        Batches run one at a time by default; RP_BATCH_PARALLELISM=N keeps up
+        to N batches in flight, each in its own worker. State and progress are
+        held in memory for the whole run and only flushed to disk at batch
+        boundaries.
 
         Args:
             batches: List of batches (each batch is a list of site keys)
             env: Environment variables
-            config_manager: ConfigManager instance
             run_id: Run identifier
             state: Current state dict
+            progress_data: Current progress dict ('completed'/'failed'/'in_progress' lists)
         """
+        # Bind this run's events so a later start_scrape can't swap them out
+        pause_event = self._pause_event
+        stop_event = self._stop_event
+
+        # Track progress as sets: O(1) membership and no duplicates on retry
+        progress_data = {key: set(progress_data.get(key, [])) for key in ('completed', 'failed', 'in_progress')}
+        completed = progress_data['completed']
+        failed = progress_data['failed']
+        in_progress = progress_data['in_progress']
+
+        parallelism = self._get_batch_parallelism(env)
+        run_watcher = False
+        if parallelism > 1 and env.get('RP_NO_AUTO_WATCHER', '0') != '1':
+            # Concurrent batches must not update the master workbook at the
+            # same time, so the watcher runs once after all batches instead
+            env = dict(env, RP_NO_AUTO_WATCHER='1')
+            run_watcher = True
+
         try:
             total_batches = len(batches)
             failed_batches = []
-
-            for batch_num, batch_sites in enumerate(batches, start=1):
-                logger.info(f"Starting batch {batch_num}/{total_batches} with {len(batch_sites)} sites")
-
-                # Update state - batch starting
-                state = self._load_state()
-                progress_data = self._load_progress()
-                progress_data['in_progress'] = batch_sites
-                self._save_progress(progress_data)
-                self._update_batch_progress(state, batch_num, total_batches, batch_sites, 'in_progress')
-
-                # Execute batch
-                result = self._execute_single_batch(batch_sites, env, config_manager)
-
-                # Update progress based on result
-                progress_data = self._load_progress()
-                progress_data['in_progress'] = []
-
-                if result['success']:
-                    # Mark batch sites as completed
-                    progress_data['completed'].extend(batch_sites)
-                    logger.info(f"Batch {batch_num}/{total_batches} completed successfully")
-                else:
-                    # Retry logic - one retry per batch
-                    logger.warning(f"Batch {batch_num}/{total_batches} failed, retrying in 30 seconds...")
-                    time.sleep(30)
-
-                    retry_result = self._execute_single_batch(batch_sites, env, config_manager)
-
-                    if retry_result['success']:
-                        progress_data['completed'].extend(batch_sites)
-                        logger.info(f"Batch {batch_num}/{total_batches} succeeded on retry")
-                    else:
-                        # Mark as failed after retry
-                        progress_data['failed'].extend(batch_sites)
-                        failed_batches.append({
-                            'batch_num': batch_num,
-                            'sites': batch_sites,
-                            'error': retry_result.get('error', 'Unknown error')
-                        })
-                        logger.error(f"Batch {batch_num}/{total_batches} failed after retry")
-
-                self._save_progress(progress_data)
-
-                # Update batch progress
-                state = self._load_state()
-                self._update_batch_progress(state, batch_num, total_batches, batch_sites, 'completed')
-
-                # Check if pause requested
-                if state.get('current_run', {}).get('paused', False):
-                    logger.info(f"Pause requested after batch {batch_num}/{total_batches}")
-
-                    # Wait for resume
-                    while state.get('current_run', {}).get('paused', False):
+            pending = deque(enumerate(batches, start=1))
+            in_flight = {}  # future -> (batch_num, batch_sites)
+            started = 0
+
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                while pending or in_flight:
+                    # Start batches up to the parallelism limit unless paused;
+                    # pause_event follows the persisted paused flag re-read at
+                    # every batch boundary
+                    while pending and len(in_flight) < parallelism and not pause_event.is_set():
+                        batch_num, batch_sites = pending.popleft()
+
+                        # Small delay between batches
+                        if started and stop_event.wait(timeout=self.batch_delay_seconds):
+                            break
+                        if stop_event.is_set():
+                            break
+
+                        # Another process may have paused or stopped the run meanwhile
+                        with self.process_lock:
+                            running = self._merge_persisted_controls(state, run_id, pause_event)
+                        if not running:
+                            self._stop_from_state_file(stop_event)
+                            break
+                        if pause_event.is_set():
+                            pending.appendleft((batch_num, batch_sites))
+                            break
+
+                        logger.info(f"Starting batch {batch_num}/{total_batches} with {len(batch_sites)} sites")
+                        started += 1
+
+                        # Update state - batch starting
+                        in_progress.update(batch_sites)
+                        self._update_batch_progress(state, batch_num, total_batches,
+                                                    sorted(in_progress), 'in_progress')
+                        if not self._flush(state, progress_data, run_id, pause_event):
+                            self._stop_from_state_file(stop_event)
+                            break
+
+                        future = executor.submit(self._run_batch_with_retry, batch_num, total_batches,
+                                                 batch_sites, env, stop_event)
+                        in_flight[future] = (batch_num, batch_sites)
+
+                    if stop_event.is_set():
+                        logger.info(f"Scraper stopped after {started}/{total_batches} batches started")
+                        return
+
+                    if not in_flight:
+                        # Paused with nothing running - wait for resume
+                        logger.info(f"Pause requested after batch {started}/{total_batches}")
                         logger.info("Scraper paused. Waiting for resume...")
-                        time.sleep(5)
-                        state = self._load_state()
 
-                        # Check if stopped while paused
-                        if not state.get('is_running', False):
-                            logger.info("Scraper stopped while paused")
-                            return
-
-                    logger.info(f"Scraper resumed, continuing with batch {batch_num + 1}")
+                        # Wait for resume, waking promptly if stopped while paused
+                        while pause_event.is_set():
+                            if stop_event.wait(timeout=0.5):
+                                logger.info("Scraper stopped while paused")
+                                return
+                            with self.process_lock:
+                                running = self._merge_persisted_controls(state, run_id, pause_event)
+                            if not running:
+                                self._stop_from_state_file(stop_event)
+                                return
+
+                        logger.info(f"Scraper resumed, continuing with batch {started + 1}")
+                        continue
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                    if stop_event.is_set():
+                        logger.info("Scraper stopped during batch execution")
+                        return
+
+                    for future in done:
+                        batch_num, batch_sites = in_flight.pop(future)
+                        result = future.result()
+
+                        # Update progress based on result
+                        in_progress.difference_update(batch_sites)
+                        if result and result['success']:
+                            # Mark batch sites as completed
+                            completed.update(batch_sites)
+                        else:
+                            # Mark as failed after retry
+                            failed.update(batch_sites)
+                            failed_batches.append({
+                                'batch_num': batch_num,
+                                'sites': batch_sites,
+                                'error': (result or {}).get('error', 'Unknown error')
+                            })
+
+                    self._counts['completed'] = len(completed)
+                    self._counts['failed'] = len(failed)
+                    self._eta_buffer.append((time.monotonic(), self._counts['completed']))
+
+                    # Update batch progress
+                    if in_progress:
+                        self._update_batch_progress(state, started, total_batches,
+                                                    sorted(in_progress), 'in_progress')
+                    else:
+                        self._update_batch_progress(state, started, total_batches, batch_sites, 'completed')
+                    if not self._flush(state, progress_data, run_id, pause_event):
+                        self._stop_from_state_file(stop_event)
+                        return
 
-                # Small delay between batches
-                if batch_num < total_batches:
-                    time.sleep(5)
+            if run_watcher and completed:
+                self._run_watcher(env)
 
             # All batches completed - finalize state
-            state = self._load_state()
             current_run = state.get('current_run', {})
             current_run['completed_at'] = datetime.now().isoformat()
             current_run['success'] = len(failed_batches) == 0
             current_run['failed_batches'] = failed_batches
 
             # Calculate final statistics
-            progress_data = self._load_progress()
             current_run['final_stats'] = {
                 'total_sites': len(current_run.get('sites', [])),
-                'successful_sites': len(progress_data.get('completed', [])),
-                'failed_sites': len(progress_data.get('failed', [])),
+                'successful_sites': self._counts['completed'],
+                'failed_sites': self._counts['failed'],
                 'failed_batches': len(failed_batches)
             }
 
             state['last_run'] = current_run
             state['is_running'] = False
             state['current_run'] = None
-            self._save_state(state)
+            self._flush(state, progress_data, run_id, pause_event)
 
             logger.info(f"Scraping run {run_id} completed: {current_run['final_stats']}")
 
         except Exception as e:
             logger.error(f"Error in batch execution: {e}")
 
+            if stop_event.is_set():
+                return
+
             # Update state with error
-            state = self._load_state()
             if state.get('current_run'):
                 current_run = state['current_run']
                 current_run['completed_at'] = datetime.now().isoformat()
@@ -548,7 +1086,20 @@ class ScraperManager:
 
             state['is_running'] = False
             state['current_run'] = None
-            self._save_state(state)
+            self._flush(state, progress_data, run_id, pause_event)
+
+        finally:
+            # On stop, stop_scrape has already terminated the workers
+            if not stop_event.is_set():
+                self._stop_workers()
+
+    def _run_watcher(self, env: Dict):
+        """Process exports into the master workbook once, after parallel batches"""
+        logger.info("Running watcher to process exports into master workbook...")
+        try:
+            subprocess.run(['python', 'watcher.py', '--once'], env=env, check=True)
+        except Exception as e:
+            logger.error(f"Watcher failed: {e}")
 
     def _monitor_process(self, process, run_id: str):
         """Monitor scraper process and update state when complete"""
@@ -616,6 +1167,10 @@ class ScraperManager:
 
                     logger.info("Scraper process stopped")
 
+                # Signal the batch thread to stop and kill any in-flight batches
+                self._stop_event.set()
+                self._kill_batches()
+
                 # Update state
                 current_run = state.get('current_run', {})
                 current_run['stopped_at'] = datetime.now().isoformat()
@@ -668,6 +1223,7 @@ class ScraperManager:
 
             state['current_run'] = current_run
             self._save_state(state)
+            self._pause_event.set()
 
             logger.info("Scraper pause requested (will pause after current batch)")
 
@@ -708,6 +1264,7 @@ class ScraperManager:
 
             state['current_run'] = current_run
             self._save_state(state)
+            self._pause_event.clear()
 
             logger.info("Scraper resumed")
 
@@ -732,6 +1289,13 @@ class ScraperManager:
             }
         """
         logger.info(f"[NEW CODE] get_history called with limit={limit}")
+
+        # Reuse the last result while neither source file has changed
+        cache_key = (self._file_signature(self.state_file),
+                     self._file_signature(self.metadata_file), limit)
+        if self._history_cache['key'] == cache_key:
+            return copy.deepcopy(self._history_cache['result'])
+
         state = self._load_state()
         metadata = self._load_metadata()
 
@@ -766,11 +1330,13 @@ class ScraperManager:
                     'error': None
                 })
 
-        # Sort by start_time
-        scrapes.sort(key=lambda x: x.get('start_time', ''), reverse=True)
+        # Newest `limit` entries by start_time (no need to sort everything)
+        newest = heapq.nlargest(limit, scrapes, key=lambda x: x.get('start_time') or '')
 
         # Return in frontend expected format
-        return {
-            'scrapes': scrapes[:limit],
+        result = {
+            'scrapes': newest,
             'total': len(scrapes)
         }
+        self._history_cache = {'key': cache_key, 'result': copy.deepcopy(result)}
+        return result
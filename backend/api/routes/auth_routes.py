@@ -3,13 +3,16 @@ Authentication Routes for Flask API
 Provides endpoints for user registration, login, and management
 """
 
+import hashlib
 import logging
-from flask import Blueprint, request, jsonify, make_response
+import re
+from flask import Blueprint, request, jsonify, make_response, g
 from functools import wraps
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
 from core.firebase_auth import get_firebase_auth_manager
+from core.ttl_cache import TTLCache
 from core.auth import create_jwt_token, decode_jwt_token
 from core.security import validate_json_input, sanitize_input
 
@@ -18,8 +21,65 @@ logger = logging.getLogger(__name__)
 # Create Blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-# Initialize Firebase Auth Manager
-auth_manager = get_firebase_auth_manager()
+
+def _auth_manager():
+    """
+    Firebase Auth Manager, initialized on first use
+
+    Deferring initialization keeps Blueprint import free of credential
+    loading, and a failed initialization is retried on the next request
+    instead of dropping the auth routes for the life of the process.
+    """
+    return get_firebase_auth_manager()
+
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_VALID_ROLES = frozenset({'admin', 'user'})
+_MAX_EMAIL_LENGTH = 255
+
+# Verified ID tokens, keyed by a hash of the raw token. Entries live for at
+# most _TOKEN_CACHE_TTL seconds and never past the token's own 'exp' claim.
+_TOKEN_CACHE_TTL = 30
+_TOKEN_CACHE_MAX = 10000
+_token_cache = TTLCache(_TOKEN_CACHE_TTL, _TOKEN_CACHE_MAX)
+
+
+def _verify_id_token_cached(token: str) -> Dict:
+    """
+    Verify a Firebase ID token, reusing recent successful verifications
+
+    Failed verifications are never cached, so the underlying ValueError
+    from FirebaseAuthManager.verify_id_token propagates unchanged. Tokens
+    that are not non-empty strings raise ValueError before hashing.
+    """
+    if not isinstance(token, str) or not token:
+        raise ValueError('ID token must be a non-empty string')
+
+    key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    decoded_token = _auth_manager().verify_id_token(token)
+    _token_cache.put(key, decoded_token, expires_at=decoded_token.get('exp'))
+    return decoded_token
+
+
+def _user_from_claims(decoded_token: Dict) -> Dict:
+    """
+    Build a user dict from verified ID token claims
+
+    Covers the profile fields the frontend needs without a get_user
+    round trip; keys match FirebaseAuthManager._user_to_dict.
+    """
+    return {
+        'uid': decoded_token.get('uid'),
+        'email': decoded_token.get('email'),
+        'display_name': decoded_token.get('name'),
+        'photo_url': decoded_token.get('picture'),
+        'email_verified': decoded_token.get('email_verified', False),
+        'custom_claims': {'role': decoded_token['role']} if 'role' in decoded_token else {}
+    }
 
 
 def require_firebase_auth(f):
@@ -38,16 +98,16 @@ def require_firebase_auth(f):
                 'message': 'Provide Firebase ID token in Authorization header as: Bearer <token>'
             }), 401
 
-        token = auth_header.replace('Bearer ', '', 1)
+        token = auth_header[7:].strip()
 
         try:
             # Verify Firebase token
-            decoded_token = auth_manager.verify_id_token(token)
+            decoded_token = _verify_id_token_cached(token)
 
-            # Attach user info to request
-            request.user_uid = decoded_token.get('uid')
-            request.user_email = decoded_token.get('email')
-            request.token_payload = decoded_token
+            # Attach user info to the request context
+            g.user_uid = decoded_token.get('uid')
+            g.user_email = decoded_token.get('email')
+            g.firebase_payload = decoded_token
 
             return f(*args, **kwargs)
 
@@ -89,20 +149,27 @@ def register():
         # Validate input
         data = validate_json_input(['email', 'password'])
 
-        email = sanitize_input(data.get('email'), max_length=255)
+        # Reject oversized or non-string emails before any further processing
+        raw_email = data.get('email')
+        if not isinstance(raw_email, str) or len(raw_email) > _MAX_EMAIL_LENGTH:
+            return jsonify({
+                'error': 'Invalid email',
+                'message': 'Please provide a valid email address'
+            }), 400
+
+        email = sanitize_input(raw_email, max_length=_MAX_EMAIL_LENGTH)
         password = data.get('password')  # Don't sanitize passwords
         display_name = sanitize_input(data.get('displayName', ''), max_length=255) or None
 
         # Validate email format
-        import re
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if not _EMAIL_RE.match(email):
             return jsonify({
                 'error': 'Invalid email',
                 'message': 'Please provide a valid email address'
             }), 400
 
         # Create user in Firebase
-        user = auth_manager.create_user(
+        user = _auth_manager().create_user(
             email=email,
             password=password,
             display_name=display_name,
@@ -110,7 +177,7 @@ def register():
         )
 
         # Create custom token for immediate login
-        custom_token = auth_manager.create_custom_token(user['uid'])
+        custom_token = _auth_manager().create_custom_token(user['uid'])
 
         logger.info(f"User registered successfully: {email}")
 
@@ -144,6 +211,9 @@ def verify_token():
         "idToken": "firebase-id-token"
     }
 
+    Query parameters:
+    - full: Fetch the full user record from Firebase (default: false, use token claims)
+
     Returns:
     {
         "valid": true,
@@ -155,10 +225,14 @@ def verify_token():
         id_token = data.get('idToken')
 
         # Verify token
-        decoded_token = auth_manager.verify_id_token(id_token)
+        decoded_token = _verify_id_token_cached(id_token)
 
-        # Get full user information
-        user = auth_manager.get_user_by_uid(decoded_token['uid'])
+        # Token claims cover the common profile fields; only fetch the full
+        # user record when explicitly requested
+        if request.args.get('full', '').lower() in ('1', 'true', 'yes'):
+            user = _auth_manager().get_user_by_uid(decoded_token['uid'])
+        else:
+            user = _user_from_claims(decoded_token)
 
         return jsonify({
             'valid': True,
@@ -187,13 +261,19 @@ def get_current_user():
 
     Requires: Authorization: Bearer <firebase-id-token>
 
+    Query parameters:
+    - refresh: Fetch the full user record from Firebase (default: false, use token claims)
+
     Returns:
     {
         "user": {...}
     }
     """
     try:
-        user = auth_manager.get_user_by_uid(request.user_uid)
+        if request.args.get('refresh', '').lower() in ('1', 'true', 'yes'):
+            user = _auth_manager().get_user_by_uid(g.user_uid)
+        else:
+            user = _user_from_claims(g.firebase_payload)
 
         if not user:
             return jsonify({
@@ -242,7 +322,7 @@ def update_current_user():
             update_params['photo_url'] = data['photoURL']
 
         # Update user
-        user = auth_manager.update_user(request.user_uid, **update_params)
+        user = _auth_manager().update_user(g.user_uid, **update_params)
 
         return jsonify({
             'success': True,
@@ -272,8 +352,8 @@ def get_user_by_id(uid: str):
     """
     try:
         # Check if user has permission (admin or self)
-        is_admin = request.token_payload.get('role') == 'admin'
-        is_self = request.user_uid == uid
+        is_admin = g.firebase_payload.get('role') == 'admin'
+        is_self = g.user_uid == uid
 
         if not (is_admin or is_self):
             return jsonify({
@@ -281,7 +361,7 @@ def get_user_by_id(uid: str):
                 'message': 'You can only view your own profile'
             }), 403
 
-        user = auth_manager.get_user_by_uid(uid)
+        user = _auth_manager().get_user_by_uid(uid)
 
         if not user:
             return jsonify({
@@ -316,7 +396,7 @@ def list_users():
     """
     try:
         # Check if user is admin
-        is_admin = request.token_payload.get('role') == 'admin'
+        is_admin = g.firebase_payload.get('role') == 'admin'
 
         if not is_admin:
             return jsonify({
@@ -328,7 +408,7 @@ def list_users():
         limit = min(int(request.args.get('limit', 100)), 1000)
 
         # List users
-        users = auth_manager.list_users(max_results=limit)
+        users = _auth_manager().list_users(max_results=limit)
 
         return jsonify({
             'users': users,
@@ -342,6 +422,69 @@ def list_users():
         }), 500
 
 
+@auth_bp.route('/users/batch', methods=['POST'])
+@require_firebase_auth
+def get_users_batch():
+    """
+    Get several users by UID in one call (admin only)
+
+    Request body:
+    {
+        "uids": ["uid1", "uid2", ...] (max 1000)
+    }
+
+    Returns:
+    {
+        "users": [...],
+        "not_found": [...],
+        "total": 2
+    }
+    """
+    try:
+        # Check if user is admin
+        is_admin = g.firebase_payload.get('role') == 'admin'
+
+        if not is_admin:
+            return jsonify({
+                'error': 'Permission denied',
+                'message': 'Only administrators can look up other users'
+            }), 403
+
+        data = validate_json_input(['uids'])
+        uids = data.get('uids')
+
+        if not isinstance(uids, list) or not all(isinstance(uid, str) for uid in uids):
+            return jsonify({
+                'error': 'Invalid uids',
+                'message': 'uids must be a list of strings'
+            }), 400
+
+        if len(uids) > 1000:
+            return jsonify({
+                'error': 'Too many uids',
+                'message': 'A maximum of 1000 uids can be requested at once'
+            }), 400
+
+        result = _auth_manager().get_users_by_uids(list(dict.fromkeys(uids)))
+
+        return jsonify({
+            'users': result['users'],
+            'not_found': result['not_found'],
+            'total': len(result['users'])
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid request',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error getting users: {e}")
+        return jsonify({
+            'error': 'Failed to get users'
+        }), 500
+
+
 @auth_bp.route('/user/<uid>', methods=['DELETE'])
 @require_firebase_auth
 def delete_user(uid: str):
@@ -356,8 +499,8 @@ def delete_user(uid: str):
     """
     try:
         # Check if user has permission (admin or self)
-        is_admin = request.token_payload.get('role') == 'admin'
-        is_self = request.user_uid == uid
+        is_admin = g.firebase_payload.get('role') == 'admin'
+        is_self = g.user_uid == uid
 
         if not (is_admin or is_self):
             return jsonify({
@@ -366,7 +509,7 @@ def delete_user(uid: str):
             }), 403
 
         # Delete user
-        auth_manager.delete_user(uid)
+        _auth_manager().delete_user(uid)
 
         return jsonify({
             'success': True,
@@ -400,7 +543,7 @@ def update_user_role(uid: str):
     """
     try:
         # Check if user is admin
-        is_admin = request.token_payload.get('role') == 'admin'
+        is_admin = g.firebase_payload.get('role') == 'admin'
 
         if not is_admin:
             return jsonify({
@@ -412,17 +555,17 @@ def update_user_role(uid: str):
         role = data.get('role')
 
         # Validate role
-        if role not in ['admin', 'user']:
+        if role not in _VALID_ROLES:
             return jsonify({
                 'error': 'Invalid role',
                 'message': 'Role must be either "admin" or "user"'
             }), 400
 
         # Set custom claims
-        auth_manager.set_custom_claims(uid, {'role': role})
+        _auth_manager().set_custom_claims(uid, {'role': role})
 
         # Revoke refresh tokens to force re-authentication with new claims
-        auth_manager.revoke_refresh_tokens(uid)
+        _auth_manager().revoke_refresh_tokens(uid)
 
         return jsonify({
             'success': True,
@@ -456,10 +599,18 @@ def request_password_reset():
     """
     try:
         data = validate_json_input(['email'])
-        email = sanitize_input(data.get('email'), max_length=255)
+
+        raw_email = data.get('email')
+        if not isinstance(raw_email, str) or len(raw_email) > _MAX_EMAIL_LENGTH:
+            return jsonify({
+                'error': 'Invalid email',
+                'message': 'Please provide a valid email address'
+            }), 400
+
+        email = sanitize_input(raw_email, max_length=_MAX_EMAIL_LENGTH)
 
         # Generate password reset link
-        reset_link = auth_manager.generate_password_reset_link(email)
+        reset_link = _auth_manager().generate_password_reset_link(email)
 
         # In production, send email instead of returning link
         # For development, return the link
@@ -499,7 +650,7 @@ def logout():
     """
     try:
         # Revoke all refresh tokens for the user
-        auth_manager.revoke_refresh_tokens(request.user_uid)
+        _auth_manager().revoke_refresh_tokens(g.user_uid)
 
         return jsonify({
             'success': True,
@@ -525,9 +676,17 @@ def health():
         "firebase_initialized": true
     }
     """
+    try:
+        manager = _auth_manager()
+        manager.ensure_initialized()
+        firebase_initialized = manager.initialized
+    except Exception as e:
+        logger.error(f"Firebase Auth Manager unavailable: {e}")
+        firebase_initialized = False
+
     return jsonify({
         'status': 'healthy',
         'service': 'authentication',
-        'firebase_initialized': auth_manager.initialized,
+        'firebase_initialized': firebase_initialized,
         'timestamp': datetime.now().isoformat()
     }), 200
@@ -85,6 +85,13 @@ except Exception as e:
 # Modern Flask 3.x approach: Use custom JSONProvider
 from flask.json.provider import DefaultJSONProvider
 
+# orjson is optional; jsonify falls back to the stdlib encoder without it
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 class CustomJSONProvider(DefaultJSONProvider):
     def default(self, obj):
         # Use our comprehensive sanitizer for all objects
@@ -96,6 +103,23 @@ class CustomJSONProvider(DefaultJSONProvider):
             return super().default(obj)
         return sanitized
 
+    def dumps(self, obj, **kwargs):
+        # Serialize with orjson when only jsonify's formatting options are set.
+        # Datetimes are passed through to default() so they keep the
+        # sanitizer's isoformat() output.
+        if HAS_ORJSON and kwargs.keys() <= {'indent', 'separators'}:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+            except TypeError:
+                # e.g. integers beyond 64 bits; the stdlib encoder handles these
+                pass
+        return super().dumps(obj, **kwargs)
+
 # Set custom JSON provider
 app.json = CustomJSONProvider(app)
 
@@ -1149,10 +1173,10 @@ def firestore_for_sale():
             # Add version marker to verify this code is running
             sanitized_result['_debug_version'] = 'v5_with_logging'
             # Use Response with explicit JSON encoding to bypass Flask's jsonify
-            import json
+            # (app.json serializes with orjson when it is installed)
             logger.info("[DEBUG] Converting to JSON...")
             try:
-                json_str = json.dumps(sanitized_result)
+                json_str = app.json.dumps(sanitized_result)
                 logger.info(f"[DEBUG] JSON conversion SUCCESS - {len(json_str)} bytes")
                 return Response(
                     json_str,
@@ -1166,9 +1190,8 @@ def firestore_for_sale():
             # Old format - result is a list
             logger.warning(f"[DEBUG] Old format detected - returning list with len={len(result)}")
             sanitized_result = sanitize_for_json(result)
-            import json
             return Response(
-                json.dumps({'properties': sanitized_result, 'total': len(result)}),
+                app.json.dumps({'properties': sanitized_result, 'total': len(result)}),
                 mimetype='application/json',
                 headers={'Access-Control-Allow-Origin': '*'}
             )
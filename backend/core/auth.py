@@ -4,6 +4,7 @@ Provides API key and JWT-based authentication for the API server
 """
 
 import os
+import hashlib
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
@@ -11,15 +12,31 @@ from flask import request, jsonify
 from typing import Optional, Dict, Callable
 import logging
 
+from core.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 # Load configuration from environment
-API_KEYS = set(os.getenv('API_KEYS', '').split(',')) if os.getenv('API_KEYS') else set()
+API_KEYS = frozenset(k.strip() for k in os.getenv('API_KEYS', '').split(',') if k.strip())
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key-change-in-production')
 JWT_ALGORITHM = 'HS256'
+# Decode settings built once: HS256 only, the claims create_jwt_token always
+# sets are required, and aud/iss (never issued here) are not checked
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {
+    'require': ['exp', 'iat', 'user_id'],
+    'verify_aud': False,
+    'verify_iss': False,
+}
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', '24'))
 AUTH_ENABLED = os.getenv('AUTH_ENABLED', 'false').lower() == 'true'
 
+# Decoded JWT payloads keyed by a digest of the token; entries live for at
+# most _JWT_CACHE_TTL seconds and never past the token's own 'exp' claim.
+_JWT_CACHE_TTL = 60
+_JWT_CACHE_MAX = 4096
+_jwt_cache = TTLCache(_JWT_CACHE_TTL, _JWT_CACHE_MAX)
+
 
 def require_api_key(f: Callable) -> Callable:
     """
@@ -94,10 +111,18 @@ def decode_jwt_token(token: str) -> Optional[Dict]:
 
     Returns:
         Decoded payload if valid, None otherwise
+
+    Successful decodes are cached briefly so repeat requests with the same
+    token skip signature verification; invalid tokens are never cached.
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    cached = _jwt_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=_JWT_ALGORITHMS,
+                             options=_JWT_DECODE_OPTIONS)
     except jwt.ExpiredSignatureError:
         logger.warning("Expired JWT token")
         return None
@@ -105,6 +130,9 @@ def decode_jwt_token(token: str) -> Optional[Dict]:
         logger.warning(f"Invalid JWT token: {e}")
         return None
 
+    _jwt_cache.put(key, payload, expires_at=payload.get('exp'))
+    return payload
+
 
 def require_jwt(f: Callable) -> Callable:
     """
@@ -129,15 +157,15 @@ def require_jwt(f: Callable) -> Callable:
         # Get token from Authorization header
         auth_header = request.headers.get('Authorization', '')
 
-        if not auth_header.startswith('Bearer '):
+        token = auth_header[7:].strip() if auth_header.startswith('Bearer ') else ''
+
+        if not token:
             logger.warning(f"Missing Bearer token for {request.endpoint}")
             return jsonify({
                 'error': 'Authentication required',
                 'message': 'Provide JWT token in Authorization header as: Bearer <token>'
             }), 401
 
-        token = auth_header.replace('Bearer ', '', 1)
-
         # Decode and validate token
         payload = decode_jwt_token(token)
 
@@ -184,8 +212,8 @@ def require_auth(f: Callable) -> Callable:
 
         # Try JWT
         auth_header = request.headers.get('Authorization', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header.replace('Bearer ', '', 1)
+        token = auth_header[7:].strip() if auth_header.startswith('Bearer ') else ''
+        if token:
             payload = decode_jwt_token(token)
 
             if payload:
@@ -7,6 +7,7 @@ Output: normalized dict with all expected keys set (None/"" if missing)
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Any
 from core.utils import (
     parse_naira,
@@ -47,13 +48,22 @@ ALL_KEYS = [
 ]
 
 _INT_PAT = re.compile(r"\b(\d+)\b")
-_BED_PAT = re.compile(r"(\d+)\s*(?:bed|br|bedroom)s?\b", re.I)
-_BATH_PAT = re.compile(r"(\d+)\s*(?:bath|ba|bathroom)s?\b", re.I)
-_TOILET_PAT = re.compile(r"(\d+)\s*(?:toilet)s?\b", re.I)
-_BQ_PAT = re.compile(r"\bbq\b|\bb\.?q\.?\b|\bboy[’'`s\s-]*quarters?\b", re.I)
-_SIZE_PAT = re.compile(r"(\d+(?:\.\d+)?)\s*(?:sqm|m\^?2|m2|sq\.?m)", re.I)
-_TITLE_DOC_PAT = re.compile(r"\b(C of O|C\.? of O|Governor'?s? Consent|Gov(?:ernor'?s?)? Consent|Excision|Deed of Assignment)\b", re.I)
-_PROMO_PAT = re.compile(r"(?:deposit|initial\s*deposit|payment\s*plan|installment|instalment|months?\s*plan|\b\d+\s*months?\b|\b\d+\s*years?\b)", re.I)
+# All soup-text fields in one alternation so a listing is scanned once;
+# each named group keeps the pattern its field used on its own
+_FIELDS_PAT = re.compile(
+    # Cheap first-character guard: lets the scanner skip positions where no
+    # field can start instead of trying every alternative there
+    r"(?=[\dbcdegimp])(?:"
+    r"(?P<beds>\d+)\s*(?:bed|br|bedroom)s?\b"
+    r"|(?P<baths>\d+)\s*(?:bath|ba|bathroom)s?\b"
+    r"|(?P<toilets>\d+)\s*(?:toilet)s?\b"
+    r"|(?P<size>\d+(?:\.\d+)?)\s*(?:sqm|m\^?2|m2|sq\.?m)"
+    r"|\b(?P<title_tag>C of O|C\.? of O|Governor'?s? Consent|Gov(?:ernor'?s?)? Consent|Excision|Deed of Assignment)\b"
+    r"|(?P<promo>deposit|initial\s*deposit|payment\s*plan|installment|instalment|months?\s*plan|\b\d+\s*months?\b|\b\d+\s*years?\b)"
+    r"|(?P<bq>\bbq\b|\bb\.?q\.?\b|\bboy[’'`s\s-]*quarters?\b))",
+    re.I,
+)
+_FIELD_NAMES = ("beds", "baths", "toilets", "size", "title_tag", "promo", "bq")
 
 def _first_nonempty(*vals):
     for v in vals:
@@ -61,35 +71,50 @@ def _first_nonempty(*vals):
             return v
     return None
 
-def _extract_size(text: str) -> str | None:
-    m = _SIZE_PAT.search(text or "")
-    return f"{m.group(1)} sqm" if m else None
-
-def _extract_beds(text: str) -> int | None:
-    m = _BED_PAT.search(text or "")
-    return int(m.group(1)) if m else None
+@lru_cache(maxsize=8192)
+def _extract_all(text: str) -> tuple:
+    """
+    Extract (beds, baths, toilets, size, title_tag, promo, bq) from text
+    in a single pass, keeping the first match of each field.
 
-def _extract_baths(text: str) -> int | None:
-    m = _BATH_PAT.search(text or "")
-    if m:
-        count = int(m.group(1))
+    Memoized: re-scrapes and paginated duplicates produce the same soup
+    text, so repeat listings skip the scan. The result is an immutable
+    tuple and safe to share.
+    """
+    text = text or ""
+    found = {}
+    pos = 0
+    while len(found) < len(_FIELD_NAMES):
+        m = _FIELDS_PAT.search(text, pos)
+        if not m:
+            break
+        name = m.lastgroup
+        if name not in found:
+            found[name] = m.group(name)
+        # Resume inside the match so overlapping fields ("3 m2 bedrooms")
+        # still see the same leftmost match their own pattern would
+        pos = m.start() + 1
+
+    beds = found.get("beds")
+    baths = found.get("baths")
+    if baths is not None:
+        baths = int(baths)
         # Validate: bathrooms should be reasonable (0-10 range)
         # Numbers > 10 are likely phone numbers (e.g., 08012345678)
-        if 0 <= count <= 10:
-            return count
-    return None
-
-def _extract_toilets(text: str) -> int | None:
-    m = _TOILET_PAT.search(text or "")
-    return int(m.group(1)) if m else None
-
-def _extract_title_tag(text: str) -> str | None:
-    m = _TITLE_DOC_PAT.search(text or "")
-    return m.group(1) if m else None
-
-def _extract_promo(text: str) -> str | None:
-    m = _PROMO_PAT.search(text or "")
-    return m.group(0) if m else None
+        if not 0 <= baths <= 10:
+            baths = None
+    toilets = found.get("toilets")
+    size = found.get("size")
+
+    return (
+        int(beds) if beds is not None else None,
+        baths,
+        int(toilets) if toilets is not None else None,
+        f"{size} sqm" if size is not None else None,
+        found.get("title_tag"),
+        found.get("promo"),
+        "bq" in found,
+    )
 
 def _compute_price_per_sqm(price_naira: int | None, size_text: str | None) -> int | None:
     if not price_naira or not size_text:
@@ -132,13 +157,14 @@ def normalize_listing(src: Dict[str, Any], site: str | None = None) -> Dict[str,
         price_per_sqm = parse_naira(ptxt.split("/")[0])
 
     soup_text = " ".join([title, desc, loc, ptxt])
-    bedrooms = _first_nonempty(src.get("bedrooms"), _extract_beds(soup_text))
-    bathrooms = _first_nonempty(src.get("bathrooms"), _extract_baths(soup_text))
-    toilets = _first_nonempty(src.get("toilets"), _extract_toilets(soup_text))
-    bq = 1 if _BQ_PAT.search(soup_text) else (src.get("bq") or 0)
-    land_size = _first_nonempty(src.get("land_size"), _extract_size(soup_text))
-    title_tag = _first_nonempty(src.get("title_tag"), _extract_title_tag(soup_text))
-    promo_tags = _first_nonempty(src.get("promo_tags"), _extract_promo(soup_text))
+    beds_x, baths_x, toilets_x, size_x, title_tag_x, promo_x, has_bq = _extract_all(soup_text)
+    bedrooms = _first_nonempty(src.get("bedrooms"), beds_x)
+    bathrooms = _first_nonempty(src.get("bathrooms"), baths_x)
+    toilets = _first_nonempty(src.get("toilets"), toilets_x)
+    bq = 1 if has_bq else (src.get("bq") or 0)
+    land_size = _first_nonempty(src.get("land_size"), size_x)
+    title_tag = _first_nonempty(src.get("title_tag"), title_tag_x)
+    promo_tags = _first_nonempty(src.get("promo_tags"), promo_x)
 
     price_per_sqm = price_per_sqm or _compute_price_per_sqm(price, land_size)
     price_per_bedroom = _compute_price_per_bedroom(price, bedrooms)
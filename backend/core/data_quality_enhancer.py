@@ -14,18 +14,23 @@ Date: 2025-12-25
 """
 
 import logging
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 # Import existing NLP capabilities
 try:
     from core.universal_nlp import (
-        classify_property_type,
-        extract_amenities,
         enhance_title_with_nlp,
         analyze_text_quality,
         extract_contact_info,
+        _classify_lowered,
+        _extract_amenities_lowered,
         NLP_AVAILABLE
     )
     NLP_IMPORTED = True
@@ -45,6 +50,14 @@ except ImportError:
     logging.warning("Could not import data_cleaner module")
     DATA_CLEANER_IMPORTED = False
 
+# numpy is optional (installed with pandas); without it batch price
+# validation falls back to validate_price per property
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,6 +93,20 @@ GENERIC_TITLES = [
     'listing',
 ]
 
+# Compiled once at import: the union patterns reject the common case with a
+# single search, the per-pattern lists name which patterns matched. URL
+# patterns are all lowercase and run against the lowercased URL, so they
+# need no IGNORECASE matching.
+_URL_RES = [(p, re.compile(p)) for p in CATEGORY_URL_PATTERNS]
+_URL_RE = re.compile('|'.join(f'(?:{p})' for p in CATEGORY_URL_PATTERNS))
+_TITLE_RES = [(p, re.compile(p)) for p in CATEGORY_TITLE_PATTERNS]
+_TITLE_RE = re.compile('|'.join(f'(?:{p})' for p in CATEGORY_TITLE_PATTERNS))
+_GENERIC_SET = frozenset(GENERIC_TITLES)
+
+CATEGORY_DESCRIPTION_KEYWORDS = ('view properties in', 'browse properties', 'search properties',
+                                 'all properties in', 'listings in')
+_DESCRIPTION_RE = re.compile('|'.join(re.escape(k) for k in CATEGORY_DESCRIPTION_KEYWORDS))
+
 
 def is_category_page(property_data: Dict) -> Tuple[bool, str]:
     """
@@ -92,30 +119,34 @@ def is_category_page(property_data: Dict) -> Tuple[bool, str]:
         Tuple of (is_category, reason)
     """
     reasons = []
+    basic_info = property_data.get('basic_info', {})
+    details = property_data.get('property_details', {})
 
     # Check 1: URL patterns
-    url = property_data.get('basic_info', {}).get('url', '')
-    for pattern in CATEGORY_URL_PATTERNS:
-        if re.search(pattern, url, re.IGNORECASE):
-            reasons.append(f"URL matches category pattern: {pattern}")
+    url = basic_info.get('url', '').lower()
+    if _URL_RE.search(url):
+        for pattern, compiled in _URL_RES:
+            if compiled.search(url):
+                reasons.append(f"URL matches category pattern: {pattern}")
 
     # Check 2: Generic title patterns
-    title = property_data.get('basic_info', {}).get('title', '')
+    title = basic_info.get('title', '')
     if title:
         title_lower = title.lower().strip()
 
         # Check against generic titles
-        if title_lower in GENERIC_TITLES:
+        if title_lower in _GENERIC_SET:
             reasons.append(f"Generic title: '{title}'")
 
         # Check against patterns
-        for pattern in CATEGORY_TITLE_PATTERNS:
-            if re.match(pattern, title):
-                reasons.append(f"Title matches category pattern: {pattern}")
+        if _TITLE_RE.match(title):
+            for pattern, compiled in _TITLE_RES:
+                if compiled.match(title):
+                    reasons.append(f"Title matches category pattern: {pattern}")
 
     # Check 3: Unrealistic property data (likely aggregated category stats)
-    bedrooms = property_data.get('property_details', {}).get('bedrooms')
-    bathrooms = property_data.get('property_details', {}).get('bathrooms')
+    bedrooms = details.get('bedrooms')
+    bathrooms = details.get('bathrooms')
 
     if bedrooms and bedrooms > 10:
         reasons.append(f"Unrealistic bedrooms: {bedrooms} (likely phone number)")
@@ -139,12 +170,10 @@ def is_category_page(property_data: Dict) -> Tuple[bool, str]:
         reasons.append(f"Missing critical fields: {', '.join(critical_missing)}")
 
     # Check 5: Description is just location info
-    description = property_data.get('basic_info', {}).get('description', '')
+    description = basic_info.get('description', '')
     if description:
         desc_lower = description.lower()
-        location_keywords = ['view properties in', 'browse properties', 'search properties',
-                            'all properties in', 'listings in']
-        if any(keyword in desc_lower for keyword in location_keywords):
+        if any(keyword in desc_lower for keyword in CATEGORY_DESCRIPTION_KEYWORDS):
             reasons.append("Description contains category page keywords")
 
     is_category = len(reasons) >= 2  # At least 2 red flags = category page
@@ -153,10 +182,92 @@ def is_category_page(property_data: Dict) -> Tuple[bool, str]:
     return is_category, reason_text
 
 
+def _category_flag_count(property_data: Dict) -> int:
+    """
+    Count is_category_page() red flags, stopping as soon as there are two.
+
+    Same checks in the same order as is_category_page(), minus the reason
+    strings, so a verdict costs only the checks needed to reach it.
+    """
+    basic_info = property_data.get('basic_info') or {}
+    flags = 0
+
+    # Check 1: URL patterns (one flag per matching pattern)
+    url = (basic_info.get('url') or '').lower()
+    if _URL_RE.search(url):
+        for _, compiled in _URL_RES:
+            if compiled.search(url):
+                flags += 1
+                if flags >= 2:
+                    return flags
+
+    # Check 2: Generic title and title patterns
+    title = basic_info.get('title', '')
+    if title:
+        if title.lower().strip() in _GENERIC_SET:
+            flags += 1
+        if _TITLE_RE.match(title):
+            for _, compiled in _TITLE_RES:
+                if compiled.match(title):
+                    flags += 1
+        if flags >= 2:
+            return flags
+
+    # Check 3: Unrealistic bedroom/bathroom counts
+    details = property_data.get('property_details') or {}
+    bedrooms = details.get('bedrooms')
+    bathrooms = details.get('bathrooms')
+    if bedrooms and bedrooms > 10:
+        flags += 1
+    if bathrooms and bathrooms > 10:
+        flags += 1
+    if flags >= 2:
+        return flags
+
+    # Check 4: At least two critical fields missing
+    price = (property_data.get('financial') or {}).get('price')
+    location = (property_data.get('location') or {}).get('area')
+    critical_missing = ((not price or price == 0)
+                        + (not location or len(location) < 3)
+                        + (not title or len(title) < 10))
+    if critical_missing >= 2:
+        flags += 1
+        if flags >= 2:
+            return flags
+
+    # Check 5: Description is just location info
+    description = basic_info.get('description', '')
+    if description and _DESCRIPTION_RE.search(description.lower()):
+        flags += 1
+
+    return flags
+
+
+def is_category_page_batch(properties: List[Dict]) -> List[bool]:
+    """
+    is_category_page() verdicts for many properties at once.
+
+    Skips building reason strings and stops checking a property once it
+    has two red flags; call is_category_page() on flagged rows for the
+    reason text.
+
+    Args:
+        properties: List of property dictionaries from Firestore
+
+    Returns:
+        List of booleans, True where the property is a category page
+    """
+    return [_category_flag_count(prop) >= 2 for prop in properties]
+
+
 # ============================================================================
 # DATA VALIDATION
 # ============================================================================
 
+# Bedroom/bathroom counts above this are treated as misparsed phone numbers
+MAX_ROOM_COUNT = 10
+
+
 def validate_bedroom_count(bedrooms: Any) -> Optional[int]:
     """
     Validate bedroom count is realistic (not a phone number).
@@ -175,7 +286,7 @@ def validate_bedroom_count(bedrooms: Any) -> Optional[int]:
 
         # Reasonable range: 0-10 bedrooms
         # Anything above 10 is likely a phone number (08012345678 → 8)
-        if 0 <= count <= 10:
+        if 0 <= count <= MAX_ROOM_COUNT:
             return count
         else:
             logger.debug(f"Rejecting unrealistic bedroom count: {count}")
@@ -201,7 +312,7 @@ def validate_bathroom_count(bathrooms: Any) -> Optional[int]:
         count = int(bathrooms)
 
         # Reasonable range: 0-10 bathrooms
-        if 0 <= count <= 10:
+        if 0 <= count <= MAX_ROOM_COUNT:
             return count
         else:
             logger.debug(f"Rejecting unrealistic bathroom count: {count}")
@@ -210,6 +321,11 @@ def validate_bathroom_count(bathrooms: Any) -> Optional[int]:
         return None
 
 
+# Reasonable price range for Nigerian properties: 100K - 10B NGN
+MIN_PRICE = 100_000
+MAX_PRICE = 10_000_000_000
+
+
 def validate_price(price: Any) -> Optional[int]:
     """
     Validate price is in reasonable range for Nigerian properties.
@@ -226,10 +342,6 @@ def validate_price(price: Any) -> Optional[int]:
     try:
         amount = int(price)
 
-        # Reasonable range: 100K - 10B NGN
-        MIN_PRICE = 100_000  # 100K NGN
-        MAX_PRICE = 10_000_000_000  # 10B NGN
-
         if MIN_PRICE <= amount <= MAX_PRICE:
             return amount
         else:
@@ -239,10 +351,154 @@ def validate_price(price: Any) -> Optional[int]:
         return None
 
 
+def _truncate_in_range_vec(values: Any, low: int, high: int) -> "np.ndarray":
+    """Truncate toward zero like int(); NaN outside [low, high] or if NaN."""
+    amounts = np.trunc(np.asarray(values, dtype=np.float64))
+    with np.errstate(invalid='ignore'):
+        valid = (amounts >= low) & (amounts <= high)
+    return np.where(valid, amounts, np.nan)
+
+
+def validate_prices_vec(prices: "np.ndarray") -> "np.ndarray":
+    """
+    Vectorized validate_price() for a numeric array.
+
+    Values are truncated toward zero like int() and kept only when inside
+    [MIN_PRICE, MAX_PRICE]; everything else, including NaN, becomes NaN.
+
+    Args:
+        prices: Array-like of numeric prices
+
+    Returns:
+        float64 array of validated prices (NaN where invalid)
+    """
+    return _truncate_in_range_vec(prices, MIN_PRICE, MAX_PRICE)
+
+
+def validate_room_counts_vec(counts: "np.ndarray") -> "np.ndarray":
+    """
+    Vectorized validate_bedroom_count() / validate_bathroom_count().
+
+    Args:
+        counts: Array-like of numeric bedroom or bathroom counts
+
+    Returns:
+        float64 array of validated counts (NaN where invalid)
+    """
+    return _truncate_in_range_vec(counts, 0, MAX_ROOM_COUNT)
+
+
+def _validate_batch_values(values: List[Any], vectorized, scalar) -> List[Optional[int]]:
+    """
+    Run a validator over a column of raw values.
+
+    Plain int/float values go through the vectorized validator in one pass;
+    anything else (strings, None, bools) uses the scalar validator.
+    """
+    if not HAS_NUMPY:
+        return [scalar(value) for value in values]
+
+    numeric = [i for i, value in enumerate(values)
+               if type(value) is int or type(value) is float]
+    results = [None] * len(values)
+    if numeric:
+        validated = vectorized([values[i] for i in numeric])
+        for i, amount in zip(numeric, validated.tolist()):
+            results[i] = None if amount != amount else int(amount)
+    numeric_set = set(numeric)
+    for i, value in enumerate(values):
+        if i not in numeric_set:
+            results[i] = scalar(value)
+    return results
+
+
+def _validate_batch_fields(properties: List[Dict]) -> Tuple[List[Optional[int]],
+                                                             List[Optional[int]],
+                                                             List[Optional[int]]]:
+    """
+    validate_price(), validate_bedroom_count() and validate_bathroom_count()
+    results for every property in a batch.
+
+    Returns:
+        (prices, bedrooms, bathrooms), each aligned with properties
+    """
+    prices = []
+    bedrooms = []
+    bathrooms = []
+    for prop in properties:
+        prices.append((prop.get('financial') or {}).get('price'))
+        details = prop.get('property_details') or {}
+        bedrooms.append(details.get('bedrooms'))
+        bathrooms.append(details.get('bathrooms'))
+
+    return (_validate_batch_values(prices, validate_prices_vec, validate_price),
+            _validate_batch_values(bedrooms, validate_room_counts_vec, validate_bedroom_count),
+            _validate_batch_values(bathrooms, validate_room_counts_vec, validate_bathroom_count))
+
+
 # ============================================================================
 # DATA ENHANCEMENT
 # ============================================================================
 
+# Upper bound on distinct texts remembered by each NLP result cache. Batch
+# re-runs over mostly unchanged documents then skip the keyword scans.
+NLP_CACHE_SIZE = 50_000
+
+
+@lru_cache(maxsize=NLP_CACHE_SIZE)
+def _cached_title(title: str, description: str, location: str) -> str:
+    return enhance_title_with_nlp(title, description, location)
+
+
+@lru_cache(maxsize=NLP_CACHE_SIZE)
+def _cached_amenities(combined_lower: str) -> Tuple[str, ...]:
+    return tuple(_extract_amenities_lowered(combined_lower))
+
+
+@lru_cache(maxsize=NLP_CACHE_SIZE)
+def _cached_type(combined_lower: str) -> Optional[str]:
+    return _classify_lowered(combined_lower)
+
+
+def _merge_amenities_nlp(combined_lower: str, existing: List[str]) -> List[str]:
+    """extract_amenities_from_property() on the lowercased title+description."""
+    extracted = _cached_amenities(combined_lower)
+
+    # Merge and deduplicate, keeping existing amenities first in their
+    # original order so unchanged lists compare equal
+    return list(dict.fromkeys(chain(existing or (), extracted)))
+
+
+def _improve_type_nlp(combined_lower: str, existing_type: Optional[str]) -> Optional[str]:
+    """improve_property_type() on the lowercased title+description."""
+    # If we already have a good type, keep it
+    if existing_type and len(existing_type) > 5:
+        return existing_type
+
+    # Return classified type or keep existing
+    return _cached_type(combined_lower) or existing_type
+
+
+def _keep_title(title: str, description: str, location: str) -> str:
+    return title
+
+
+def _keep_existing(combined_lower: str, existing: Any) -> Any:
+    return existing
+
+
+# Bind the NLP-backed or passthrough helpers once at import instead of
+# checking NLP_IMPORTED on every call
+if NLP_IMPORTED:
+    _enhance_title_text = _cached_title
+    _merge_amenities = _merge_amenities_nlp
+    _improve_type_text = _improve_type_nlp
+else:
+    _enhance_title_text = _keep_title
+    _merge_amenities = _keep_existing
+    _improve_type_text = _keep_existing
+
+
 def enhance_title(property_data: Dict) -> str:
     """
     Enhance generic property titles using NLP.
@@ -253,17 +509,10 @@ def enhance_title(property_data: Dict) -> str:
     Returns:
         Enhanced title
     """
-    if not NLP_IMPORTED:
-        return property_data.get('basic_info', {}).get('title', '')
-
-    title = property_data.get('basic_info', {}).get('title', '')
-    description = property_data.get('basic_info', {}).get('description', '')
-    location = property_data.get('location', {}).get('area', '')
-
-    # Use NLP to enhance
-    enhanced = enhance_title_with_nlp(title, description, location)
-
-    return enhanced
+    basic_info = property_data.get('basic_info', {})
+    return _enhance_title_text(basic_info.get('title', ''),
+                               basic_info.get('description', ''),
+                               property_data.get('location', {}).get('area', ''))
 
 
 def extract_amenities_from_property(property_data: Dict) -> List[str]:
@@ -276,23 +525,13 @@ def extract_amenities_from_property(property_data: Dict) -> List[str]:
     Returns:
         List of amenities
     """
+    existing = property_data.get('amenities', {}).get('features', [])
     if not NLP_IMPORTED:
-        return property_data.get('amenities', {}).get('features', [])
-
-    # Get existing amenities
-    existing = property_data.get('amenities', {}).get('features', []) or []
-
-    # Extract from description
-    description = property_data.get('basic_info', {}).get('description', '')
-    title = property_data.get('basic_info', {}).get('title', '')
-
-    combined_text = f"{title} {description}"
-    extracted = extract_amenities(combined_text)
+        return existing
 
-    # Merge and deduplicate
-    all_amenities = list(set(existing + extracted))
-
-    return all_amenities
+    basic_info = property_data.get('basic_info', {})
+    combined_lower = f"{basic_info.get('title', '')} {basic_info.get('description', '')}".lower()
+    return _merge_amenities(combined_lower, existing)
 
 
 def improve_property_type(property_data: Dict) -> Optional[str]:
@@ -305,24 +544,15 @@ def improve_property_type(property_data: Dict) -> Optional[str]:
     Returns:
         Improved property type
     """
-    if not NLP_IMPORTED:
-        return property_data.get('property_details', {}).get('property_type')
-
     existing_type = property_data.get('property_details', {}).get('property_type')
 
-    # If we already have a good type, keep it
-    if existing_type and len(existing_type) > 5:
+    # Only build the combined text when it will actually be classified
+    if not NLP_IMPORTED or (existing_type and len(existing_type) > 5):
         return existing_type
 
-    # Try to classify from title and description
-    title = property_data.get('basic_info', {}).get('title', '')
-    description = property_data.get('basic_info', {}).get('description', '')
-
-    combined_text = f"{title} {description}"
-    classified = classify_property_type(combined_text)
-
-    # Return classified type or keep existing
-    return classified or existing_type
+    basic_info = property_data.get('basic_info', {})
+    combined_lower = f"{basic_info.get('title', '')} {basic_info.get('description', '')}".lower()
+    return _improve_type_text(combined_lower, existing_type)
 
 
 def calculate_quality_score(property_data: Dict) -> int:
@@ -339,9 +569,15 @@ def calculate_quality_score(property_data: Dict) -> int:
     """
     score = 0
 
+    # Look up each nested section once
+    basic_info = property_data.get('basic_info', {})
+    location = property_data.get('location', {})
+    details = property_data.get('property_details', {})
+
     # Basic info (40 points max)
-    if property_data.get('basic_info', {}).get('title'):
-        title_len = len(property_data['basic_info']['title'])
+    title = basic_info.get('title')
+    if title:
+        title_len = len(title)
         if title_len > 30:
             score += 15
         elif title_len > 15:
@@ -349,8 +585,9 @@ def calculate_quality_score(property_data: Dict) -> int:
         elif title_len > 5:
             score += 5
 
-    if property_data.get('basic_info', {}).get('description'):
-        desc_len = len(property_data['basic_info']['description'])
+    description = basic_info.get('description')
+    if description:
+        desc_len = len(description)
         if desc_len > 200:
             score += 15
         elif desc_len > 50:
@@ -358,7 +595,7 @@ def calculate_quality_score(property_data: Dict) -> int:
         elif desc_len > 10:
             score += 5
 
-    if property_data.get('basic_info', {}).get('url'):
+    if basic_info.get('url'):
         score += 10
 
     # Financial (20 points max)
@@ -367,26 +604,25 @@ def calculate_quality_score(property_data: Dict) -> int:
         score += 20
 
     # Location (15 points max)
-    if property_data.get('location', {}).get('area'):
+    if location.get('area'):
         score += 10
-    if property_data.get('location', {}).get('coordinates'):
+    if location.get('coordinates'):
         score += 5
 
     # Property details (15 points max)
-    if property_data.get('property_details', {}).get('property_type'):
+    if details.get('property_type'):
         score += 5
 
-    bedrooms = property_data.get('property_details', {}).get('bedrooms')
+    bedrooms = details.get('bedrooms')
     if bedrooms and validate_bedroom_count(bedrooms):
         score += 5
 
-    bathrooms = property_data.get('property_details', {}).get('bathrooms')
+    bathrooms = details.get('bathrooms')
     if bathrooms and validate_bathroom_count(bathrooms):
         score += 5
 
     # Media (5 points max)
-    images = property_data.get('media', {}).get('images', [])
-    if images and len(images) > 0:
+    if property_data.get('media', {}).get('images', []):
         score += 5
 
     # Agent info (5 points max)
@@ -401,13 +637,15 @@ def calculate_quality_score(property_data: Dict) -> int:
 # ============================================================================
 
 def enhance_property_data(property_data: Dict,
-                         validate_only: bool = False) -> Dict[str, Any]:
+                         validate_only: bool = False,
+                         now_iso: Optional[str] = None) -> Dict[str, Any]:
     """
     Enhance a single property's data quality using NLP and validation.
 
     Args:
         property_data: Property dictionary from Firestore
         validate_only: If True, only validate without enhancing
+        now_iso: last_enhanced timestamp to record (default: current time)
 
     Returns:
         Dictionary with enhanced property and metadata:
@@ -419,89 +657,136 @@ def enhance_property_data(property_data: Dict,
             'changes_made': List[str]
         }
     """
-    changes = []
-
     # Step 1: Check if category page
     is_category, category_reason = is_category_page(property_data)
 
     if is_category:
-        logger.info(f"Category page detected: {category_reason}")
-        return {
-            'enhanced_property': property_data,
-            'is_category_page': True,
-            'category_reason': category_reason,
-            'quality_score': 0,
-            'changes_made': []
-        }
+        return _category_page_result(property_data, category_reason)
+
+    return _enhance_valid_property(property_data, validate_only, now_iso=now_iso)
 
-    # Make a copy for enhancement
+
+_UNSET = object()
+
+
+def _writable_section(enhanced: Dict, original: Dict, key: str) -> Dict:
+    """
+    Return enhanced[key] ready for writing.
+
+    Sections still shared with the input property are copied on first
+    write, so enhancing never mutates the caller's nested dicts and
+    untouched sections are not copied at all.
+    """
+    section = enhanced.get(key)
+    if not section or section is original.get(key):
+        section = dict(section or {})
+        enhanced[key] = section
+    return section
+
+
+def _category_page_result(property_data: Dict, category_reason: str) -> Dict[str, Any]:
+    """Result of enhance_property_data for a detected category page."""
+    logger.info(f"Category page detected: {category_reason}")
+    return {
+        'enhanced_property': property_data,
+        'is_category_page': True,
+        'category_reason': category_reason,
+        'quality_score': 0,
+        'changes_made': []
+    }
+
+
+def _enhance_valid_property(property_data: Dict, validate_only: bool,
+                            validated_price: Any = _UNSET,
+                            validated_bedrooms: Any = _UNSET,
+                            validated_bathrooms: Any = _UNSET,
+                            now_iso: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Steps 2-8 of enhance_property_data for a property already known not to
+    be a category page. Batch callers may pass precomputed validated
+    price/bedroom/bathroom values and a shared now_iso timestamp.
+    """
+    changes = []
+
+    # Shallow copy (metadata is always stamped); nested sections are only
+    # copied when written, via _writable_section. Look up each section once.
     enhanced = dict(property_data)
+    basic_info = enhanced.get('basic_info') or {}
+    details = enhanced.get('property_details') or {}
+    financial = enhanced.get('financial') or {}
 
     if not validate_only:
         # Step 2: Enhance title
-        original_title = enhanced.get('basic_info', {}).get('title', '')
-        enhanced_title = enhance_title(enhanced)
-        if enhanced_title != original_title:
-            if 'basic_info' not in enhanced:
-                enhanced['basic_info'] = {}
-            enhanced['basic_info']['title'] = enhanced_title
-            changes.append(f"Enhanced title: '{original_title}' → '{enhanced_title}'")
-
-        # Step 3: Extract and add amenities
+        # Titles over 30 chars are kept as-is by the NLP helper, so skip the
+        # call (and hashing the description for its cache) entirely
+        title = basic_info.get('title', '')
+        description = basic_info.get('description', '')
+        if not (title and len(title) > 30):
+            enhanced_title = _enhance_title_text(title, description,
+                                                 (enhanced.get('location') or {}).get('area', ''))
+            if enhanced_title != title:
+                basic_info = _writable_section(enhanced, property_data, 'basic_info')
+                basic_info['title'] = enhanced_title
+                changes.append(f"Enhanced title: '{title}' → '{enhanced_title}'")
+                title = enhanced_title
+
         if NLP_IMPORTED:
-            amenities = extract_amenities_from_property(enhanced)
-            original_amenities = enhanced.get('amenities', {}).get('features', [])
+            # Amenities and type share one lowercased text built from the
+            # final title, so it is only prepared once per property
+            combined_lower = f"{title} {description}".lower()
+
+            # Step 3: Extract and add amenities
+            amenities_section = enhanced.get('amenities') or {}
+            original_amenities = amenities_section.get('features', [])
+            amenities = _merge_amenities(combined_lower, original_amenities)
             if amenities and amenities != original_amenities:
-                if 'amenities' not in enhanced:
-                    enhanced['amenities'] = {}
-                enhanced['amenities']['features'] = amenities
+                _writable_section(enhanced, property_data, 'amenities')['features'] = amenities
                 changes.append(f"Added {len(amenities)} amenities")
 
-        # Step 4: Improve property type
-        if NLP_IMPORTED:
-            improved_type = improve_property_type(enhanced)
-            original_type = enhanced.get('property_details', {}).get('property_type')
+            # Step 4: Improve property type (a specific existing type is kept)
+            original_type = details.get('property_type')
+            if original_type and len(original_type) > 5:
+                improved_type = original_type
+            else:
+                improved_type = _improve_type_text(combined_lower, original_type)
             if improved_type and improved_type != original_type:
-                if 'property_details' not in enhanced:
-                    enhanced['property_details'] = {}
-                enhanced['property_details']['property_type'] = improved_type
+                details = _writable_section(enhanced, property_data, 'property_details')
+                details['property_type'] = improved_type
                 changes.append(f"Improved property type: '{original_type}' → '{improved_type}'")
 
     # Step 5: Validate bedroom count
-    bedrooms = enhanced.get('property_details', {}).get('bedrooms')
-    validated_bedrooms = validate_bedroom_count(bedrooms)
+    bedrooms = details.get('bedrooms')
+    if validated_bedrooms is _UNSET:
+        validated_bedrooms = validate_bedroom_count(bedrooms)
     if bedrooms != validated_bedrooms:
-        if 'property_details' not in enhanced:
-            enhanced['property_details'] = {}
-        enhanced['property_details']['bedrooms'] = validated_bedrooms
+        details = _writable_section(enhanced, property_data, 'property_details')
+        details['bedrooms'] = validated_bedrooms
         changes.append(f"Fixed bedrooms: {bedrooms} → {validated_bedrooms}")
 
     # Step 6: Validate bathroom count
-    bathrooms = enhanced.get('property_details', {}).get('bathrooms')
-    validated_bathrooms = validate_bathroom_count(bathrooms)
+    bathrooms = details.get('bathrooms')
+    if validated_bathrooms is _UNSET:
+        validated_bathrooms = validate_bathroom_count(bathrooms)
     if bathrooms != validated_bathrooms:
-        if 'property_details' not in enhanced:
-            enhanced['property_details'] = {}
-        enhanced['property_details']['bathrooms'] = validated_bathrooms
+        details = _writable_section(enhanced, property_data, 'property_details')
+        details['bathrooms'] = validated_bathrooms
         changes.append(f"Fixed bathrooms: {bathrooms} → {validated_bathrooms}")
 
     # Step 7: Validate price
-    price = enhanced.get('financial', {}).get('price')
-    validated_price = validate_price(price)
+    price = financial.get('price')
+    if validated_price is _UNSET:
+        validated_price = validate_price(price)
     if price != validated_price:
-        if 'financial' not in enhanced:
-            enhanced['financial'] = {}
-        enhanced['financial']['price'] = validated_price
+        _writable_section(enhanced, property_data, 'financial')['price'] = validated_price
         changes.append(f"Fixed price: {price:,} → {validated_price:,}" if validated_price else f"Removed invalid price: {price}")
 
     # Step 8: Calculate quality score
     quality_score = calculate_quality_score(enhanced)
 
     # Add metadata
-    if 'metadata' not in enhanced:
-        enhanced['metadata'] = {}
-    enhanced['metadata']['quality_score'] = quality_score
-    enhanced['metadata']['last_enhanced'] = datetime.now().isoformat()
+    metadata = _writable_section(enhanced, property_data, 'metadata')
+    metadata['quality_score'] = quality_score
+    metadata['last_enhanced'] = now_iso or datetime.now().isoformat()
 
     return {
         'enhanced_property': enhanced,
@@ -512,14 +797,100 @@ def enhance_property_data(property_data: Dict,
     }
 
 
+# Below this many properties, worker start-up and pickling cost more than
+# the parallel speedup, so batches stay in-process
+PARALLEL_MIN_BATCH = 32
+
+
+def _enhance_chunk(chunk: List[Dict], validate_only: bool,
+                   now_iso: str) -> Tuple[List[Dict], List[Dict], int, int, List[bool]]:
+    """
+    Enhance one slice of a batch, stamping every property with now_iso.
+
+    Returns:
+        (enhanced_properties, category_pages, total_changes, total_quality,
+        is_category per input property)
+    """
+    enhanced_properties = []
+    category_pages = []
+    total_changes = 0
+    total_quality = 0
+    outcomes = []
+
+    # Category verdicts for the whole chunk up front; reasons are only
+    # computed for the flagged rows
+    category_flags = is_category_page_batch(chunk)
+    validated = zip(*_validate_batch_fields(chunk))
+
+    for prop, flagged, (price, bedrooms, bathrooms) in zip(chunk, category_flags, validated):
+        if flagged:
+            is_category, category_reason = is_category_page(prop)
+            if is_category:
+                result = _category_page_result(prop, category_reason)
+            else:
+                result = _enhance_valid_property(prop, validate_only, price, bedrooms,
+                                                 bathrooms, now_iso)
+        else:
+            result = _enhance_valid_property(prop, validate_only, price, bedrooms,
+                                             bathrooms, now_iso)
+
+        outcomes.append(result['is_category_page'])
+        if result['is_category_page']:
+            category_pages.append({
+                'property': prop,
+                'reason': result['category_reason']
+            })
+        else:
+            enhanced_properties.append(result['enhanced_property'])
+            total_changes += len(result['changes_made'])
+            total_quality += result['quality_score']
+
+    return enhanced_properties, category_pages, total_changes, total_quality, outcomes
+
+
+def _content_key(property_data: Dict) -> int:
+    """Hash of the title and description, the inputs of the NLP steps."""
+    basic_info = property_data.get('basic_info') or {}
+    return hash((str(basic_info.get('title') or ''), str(basic_info.get('description') or '')))
+
+
+def _restore_input_order(chunk_results: List[Tuple], order: List[int]) -> List[Tuple]:
+    """
+    Merge chunk results computed over properties[order] back into one
+    result in the original input order.
+    """
+    placed = [None] * len(order)
+    total_changes = 0
+    total_quality = 0
+    position = 0
+    for chunk_enhanced, chunk_categories, chunk_changes, chunk_quality, outcomes in chunk_results:
+        enhanced_iter = iter(chunk_enhanced)
+        category_iter = iter(chunk_categories)
+        for is_category in outcomes:
+            placed[order[position]] = (is_category,
+                                       next(category_iter) if is_category else next(enhanced_iter))
+            position += 1
+        total_changes += chunk_changes
+        total_quality += chunk_quality
+
+    return [([item for is_category, item in placed if not is_category],
+             [item for is_category, item in placed if is_category],
+             total_changes, total_quality,
+             [is_category for is_category, _ in placed])]
+
+
 def batch_enhance_properties(properties: List[Dict],
-                             validate_only: bool = False) -> Dict[str, Any]:
+                             validate_only: bool = False,
+                             max_workers: Optional[int] = 1) -> Dict[str, Any]:
     """
     Enhance multiple properties in batch.
 
     Args:
         properties: List of property dictionaries
         validate_only: If True, only validate without enhancing
+        max_workers: Worker processes to spread the batch over (None = CPU
+            count). 1, or batches under PARALLEL_MIN_BATCH, run in-process.
+            With workers, returned properties are copies of the inputs.
 
     Returns:
         Dictionary with results:
@@ -532,23 +903,40 @@ def batch_enhance_properties(properties: List[Dict],
             'average_quality_score': float
         }
     """
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    # One clock read per batch; every property gets the same last_enhanced
+    now_iso = datetime.now().isoformat()
+
+    if workers <= 1 or len(properties) < PARALLEL_MIN_BATCH:
+        chunk_results = [_enhance_chunk(properties, validate_only, now_iso)]
+    else:
+        # Send listings with identical title+description (the same ad posted
+        # by several agents) to the same worker, whose NLP caches then
+        # process each distinct text once; results are put back in input
+        # order afterwards
+        order = sorted(range(len(properties)), key=lambda i: _content_key(properties[i]))
+        grouped = [properties[i] for i in order]
+        chunk_size = max(1, len(grouped) // (workers * 4))
+        chunks = [grouped[start:start + chunk_size]
+                  for start in range(0, len(grouped), chunk_size)]
+        # Spawned, not forked: callers such as enhance_firestore_data.py
+        # already hold live Firestore gRPC channels, which do not survive a fork
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            chunk_results = list(executor.map(_enhance_chunk, chunks,
+                                              [validate_only] * len(chunks),
+                                              [now_iso] * len(chunks)))
+        chunk_results = _restore_input_order(chunk_results, order)
+
     enhanced_properties = []
     category_pages = []
     total_changes = 0
     total_quality = 0
-
-    for prop in properties:
-        result = enhance_property_data(prop, validate_only=validate_only)
-
-        if result['is_category_page']:
-            category_pages.append({
-                'property': prop,
-                'reason': result['category_reason']
-            })
-        else:
-            enhanced_properties.append(result['enhanced_property'])
-            total_changes += len(result['changes_made'])
-            total_quality += result['quality_score']
+    for chunk_enhanced, chunk_categories, chunk_changes, chunk_quality, _ in chunk_results:
+        enhanced_properties.extend(chunk_enhanced)
+        category_pages.extend(chunk_categories)
+        total_changes += chunk_changes
+        total_quality += chunk_quality
 
     avg_quality = total_quality / len(enhanced_properties) if enhanced_properties else 0
 
@@ -5,14 +5,33 @@ Handles user authentication, registration, and management using Firebase Auth
 
 import os
 import logging
-from typing import Optional, Dict, List
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterator, List
 from datetime import datetime, timedelta
+from functools import lru_cache
 import firebase_admin
 from firebase_admin import credentials, auth
 from pathlib import Path
 
+from core.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# orjson is optional; both loads() accept the str credentials JSON
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# User records fetched by UID or email are reused for up to USER_CACHE_TTL
+# seconds; writes made through this manager invalidate them immediately.
+USER_CACHE_TTL = 60
+USER_CACHE_MAX = 10000
+# Seconds allowed for fetching Google's public keys through the shared cache
+KEY_FETCH_TIMEOUT = 10
+
 
 class FirebaseAuthManager:
     """
@@ -34,43 +53,124 @@ class FirebaseAuthManager:
         Args:
             credentials_path: Path to Firebase service account JSON file
         """
-        import json
-
+        self.credentials_path = credentials_path
         self.initialized = False
+        self._init_lock = threading.Lock()
+        self._user_cache = TTLCache(USER_CACHE_TTL, USER_CACHE_MAX)
 
-        # Initialize Firebase Admin SDK if not already initialized
-        try:
-            if not firebase_admin._apps:
-                # Try FIREBASE_CREDENTIALS environment variable first (JSON string)
-                cred_json = os.getenv('FIREBASE_CREDENTIALS')
-                if cred_json:
-                    cred = credentials.Certificate(json.loads(cred_json))
-                    firebase_admin.initialize_app(cred)
-                    logger.info("Firebase Admin SDK initialized from FIREBASE_CREDENTIALS environment variable")
+    def ensure_initialized(self) -> None:
+        """
+        Initialize the Firebase Admin SDK on first use
+
+        Construction has no side effects, so importing modules or building
+        the singleton in processes that never authenticate skips reading
+        and parsing the service account credentials. A failed
+        initialization raises and is retried on the next call.
+        """
+        if self.initialized:
+            return
+
+        with self._init_lock:
+            if self.initialized:
+                return
+
+            credentials_path = self.credentials_path
+            try:
+                if not firebase_admin._apps:
+                    # Try FIREBASE_CREDENTIALS environment variable first (JSON string)
+                    cred_json = os.getenv('FIREBASE_CREDENTIALS')
+                    if cred_json:
+                        cred = credentials.Certificate(_loads(cred_json))
+                        firebase_admin.initialize_app(cred)
+                        logger.info("Firebase Admin SDK initialized from FIREBASE_CREDENTIALS environment variable")
+                    else:
+                        # Fall back to file path from parameter or environment
+                        if not credentials_path:
+                            credentials_path = os.getenv(
+                                'FIREBASE_SERVICE_ACCOUNT',
+                                'realtor-s-practice-firebase-adminsdk-fbsvc-3071684e9a.json'
+                            )
+
+                        # Convert to absolute path if needed
+                        if not os.path.isabs(credentials_path):
+                            # Look in backend directory
+                            backend_dir = Path(__file__).parent.parent
+                            credentials_path = str(backend_dir / credentials_path)
+
+                        cred = credentials.Certificate(credentials_path)
+                        firebase_admin.initialize_app(cred)
+                        logger.info(f"Firebase Admin SDK initialized with credentials: {credentials_path}")
                 else:
-                    # Fall back to file path from parameter or environment
-                    if not credentials_path:
-                        credentials_path = os.getenv(
-                            'FIREBASE_SERVICE_ACCOUNT',
-                            'realtor-s-practice-firebase-adminsdk-fbsvc-3071684e9a.json'
-                        )
-
-                    # Convert to absolute path if needed
-                    if not os.path.isabs(credentials_path):
-                        # Look in backend directory
-                        backend_dir = Path(__file__).parent.parent
-                        credentials_path = str(backend_dir / credentials_path)
-
-                    cred = credentials.Certificate(credentials_path)
-                    firebase_admin.initialize_app(cred)
-                    logger.info(f"Firebase Admin SDK initialized with credentials: {credentials_path}")
-            else:
-                logger.info("Firebase Admin SDK already initialized")
+                    logger.info("Firebase Admin SDK already initialized")
+            except Exception as e:
+                logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
+                raise
 
+            self._enable_shared_key_cache()
             self.initialized = True
+
+    def _enable_shared_key_cache(self) -> None:
+        """
+        Share Google's token-signing public keys between worker processes
+
+        verify_id_token caches the public keys in memory only, so every
+        gunicorn worker fetches them again on its first authenticated
+        request. Setting FIREBASE_KEY_CACHE_DIR backs the verifier's HTTP
+        cache with a file cache in that directory, letting workers reuse
+        keys fetched by any other worker until Google's Cache-Control
+        max-age expires. The directory must be owned by the current user
+        with mode 0700, since anyone who can write to it can plant signing
+        keys; otherwise the SDK verifier is left untouched.
+        """
+        cache_dir = os.getenv('FIREBASE_KEY_CACHE_DIR')
+        if not cache_dir:
+            return
+
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            st = os.lstat(cache_dir)
+            if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid()
+                    or stat.S_IMODE(st.st_mode) != 0o700):
+                logger.warning(
+                    f"Shared Firebase public key cache disabled: {cache_dir} must be "
+                    f"a directory owned by the current user with mode 0700"
+                )
+                return
+
+            import requests
+            import cachecontrol
+            from cachecontrol.caches.file_cache import FileCache
+            from google.auth.transport import requests as google_requests
+
+            class _TimeoutRequest(google_requests.Request):
+                """Transport applying KEY_FETCH_TIMEOUT to every key fetch"""
+
+                def __call__(self, *args, **kwargs):
+                    kwargs.setdefault('timeout', KEY_FETCH_TIMEOUT)
+                    return super().__call__(*args, **kwargs)
+
+            session = cachecontrol.CacheControl(requests.Session(), cache=FileCache(cache_dir))
+            verifier = auth._get_client(firebase_admin.get_app())._token_verifier
+            verifier.request = _TimeoutRequest(session=session)
+            logger.debug(f"Firebase public key cache: {cache_dir}")
         except Exception as e:
-            logger.error(f"Failed to initialize Firebase Admin SDK: {e}")
-            raise
+            # Private SDK internals, os.getuid (Windows) or filelock unavailable;
+            # keep the default in-memory cache
+            logger.debug(f"Shared Firebase public key cache disabled: {e}")
+
+    def _cached_user(self, key: tuple) -> Optional[Dict]:
+        """Return a cached user dict for key, or None if missing or expired."""
+        return self._user_cache.get(key)
+
+    def _cache_user(self, user: Dict) -> None:
+        """Cache a user dict under both its UID and its email."""
+        self._user_cache.put(('uid', user['uid']), user)
+        if user.get('email'):
+            self._user_cache.put(('email', user['email']), user)
+
+    def _invalidate_user(self, uid: str) -> None:
+        """Drop every cached entry for a user after it is modified."""
+        self._user_cache.discard_if(lambda key, user: user['uid'] == uid)
 
     def create_user(self, email: str, password: str, display_name: Optional[str] = None,
                    additional_claims: Optional[Dict] = None) -> Dict:
@@ -89,6 +189,8 @@ class FirebaseAuthManager:
         Raises:
             ValueError: If user creation fails
         """
+        self.ensure_initialized()
+
         try:
             # Validate password
             if len(password) < 6:
@@ -140,6 +242,8 @@ class FirebaseAuthManager:
         Raises:
             ValueError: If token is invalid or expired
         """
+        self.ensure_initialized()
+
         try:
             decoded_token = auth.verify_id_token(id_token)
             return decoded_token
@@ -162,6 +266,8 @@ class FirebaseAuthManager:
         Returns:
             Custom token string
         """
+        self.ensure_initialized()
+
         try:
             token = auth.create_custom_token(uid, additional_claims)
             return token.decode('utf-8') if isinstance(token, bytes) else token
@@ -179,9 +285,16 @@ class FirebaseAuthManager:
         Returns:
             User information or None if not found
         """
+        self.ensure_initialized()
+
+        cached = self._cached_user(('email', email))
+        if cached is not None:
+            return cached
+
         try:
-            user = auth.get_user_by_email(email)
-            return self._user_to_dict(user)
+            user = self._user_to_dict(auth.get_user_by_email(email))
+            self._cache_user(user)
+            return user
         except auth.UserNotFoundError:
             return None
         except Exception as e:
@@ -198,15 +311,49 @@ class FirebaseAuthManager:
         Returns:
             User information or None if not found
         """
+        self.ensure_initialized()
+
+        cached = self._cached_user(('uid', uid))
+        if cached is not None:
+            return cached
+
         try:
-            user = auth.get_user(uid)
-            return self._user_to_dict(user)
+            user = self._user_to_dict(auth.get_user(uid))
+            self._cache_user(user)
+            return user
         except auth.UserNotFoundError:
             return None
         except Exception as e:
             logger.error(f"Error getting user by UID: {e}")
             return None
 
+    def get_users_by_uids(self, uids: List[str]) -> Dict:
+        """
+        Get information for several users in batched lookups
+
+        Args:
+            uids: User IDs (looked up 100 per request, the Firebase maximum)
+
+        Returns:
+            Dict with 'users' (list of user dicts) and 'not_found' (list of UIDs)
+        """
+        self.ensure_initialized()
+
+        users = []
+        not_found = []
+
+        try:
+            for start in range(0, len(uids), 100):
+                chunk = uids[start:start + 100]
+                result = auth.get_users([auth.UidIdentifier(uid) for uid in chunk])
+                users.extend(self._user_to_dict(user) for user in result.users)
+                not_found.extend(identifier.uid for identifier in result.not_found)
+        except Exception as e:
+            logger.error(f"Error getting users by UID: {e}")
+            raise ValueError(f"Failed to get users: {str(e)}")
+
+        return {'users': users, 'not_found': not_found}
+
     def update_user(self, uid: str, **kwargs) -> Dict:
         """
         Update user information
@@ -218,8 +365,11 @@ class FirebaseAuthManager:
         Returns:
             Updated user information
         """
+        self.ensure_initialized()
+
         try:
             user = auth.update_user(uid, **kwargs)
+            self._invalidate_user(uid)
             logger.info(f"Updated user: {uid}")
             return self._user_to_dict(user)
         except auth.UserNotFoundError:
@@ -238,8 +388,11 @@ class FirebaseAuthManager:
         Returns:
             True if successful
         """
+        self.ensure_initialized()
+
         try:
             auth.delete_user(uid)
+            self._invalidate_user(uid)
             logger.info(f"Deleted user: {uid}")
             return True
         except auth.UserNotFoundError:
@@ -258,6 +411,8 @@ class FirebaseAuthManager:
         Returns:
             List of user dictionaries
         """
+        self.ensure_initialized()
+
         try:
             users = []
             page = auth.list_users(max_results=max_results)
@@ -270,6 +425,37 @@ class FirebaseAuthManager:
             logger.error(f"Error listing users: {e}")
             return []
 
+    def list_all_users(self, page_size: int = 1000) -> Iterator[Dict]:
+        """
+        Iterate over every user, one page of results at a time
+
+        Each page only yields its page token once fetched, so pages cannot
+        be requested in parallel. Instead the next page is fetched in a
+        background thread while the current one is converted and consumed,
+        overlapping the HTTP round trip with the caller's work.
+
+        Args:
+            page_size: Users per page (Firebase maximum is 1000)
+
+        Yields:
+            User dictionaries
+        """
+        self.ensure_initialized()
+
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="firebase-users") as executor:
+                page = auth.list_users(max_results=page_size)
+                while page is not None:
+                    next_page = executor.submit(page.get_next_page) if page.has_next_page else None
+
+                    for user in page.users:
+                        yield self._user_to_dict(user)
+
+                    page = next_page.result() if next_page else None
+        except Exception as e:
+            logger.error(f"Error listing users: {e}")
+            raise ValueError(f"Failed to list users: {str(e)}")
+
     def set_custom_claims(self, uid: str, claims: Dict) -> bool:
         """
         Set custom claims for a user (roles, permissions)
@@ -281,8 +467,11 @@ class FirebaseAuthManager:
         Returns:
             True if successful
         """
+        self.ensure_initialized()
+
         try:
             auth.set_custom_user_claims(uid, claims)
+            self._invalidate_user(uid)
             logger.info(f"Set custom claims for user {uid}: {claims}")
             return True
         except Exception as e:
@@ -299,6 +488,8 @@ class FirebaseAuthManager:
         Returns:
             Password reset link
         """
+        self.ensure_initialized()
+
         try:
             link = auth.generate_password_reset_link(email)
             logger.info(f"Generated password reset link for {email}")
@@ -317,6 +508,8 @@ class FirebaseAuthManager:
         Returns:
             Email verification link
         """
+        self.ensure_initialized()
+
         try:
             link = auth.generate_email_verification_link(email)
             logger.info(f"Generated email verification link for {email}")
@@ -335,8 +528,11 @@ class FirebaseAuthManager:
         Returns:
             True if successful
         """
+        self.ensure_initialized()
+
         try:
             auth.revoke_refresh_tokens(uid)
+            self._invalidate_user(uid)
             logger.info(f"Revoked refresh tokens for user: {uid}")
             return True
         except Exception as e:
@@ -353,6 +549,7 @@ class FirebaseAuthManager:
         Returns:
             User dictionary
         """
+        metadata = user.user_metadata
         return {
             'uid': user.uid,
             'email': user.email,
@@ -360,12 +557,32 @@ class FirebaseAuthManager:
             'photo_url': user.photo_url,
             'email_verified': user.email_verified,
             'disabled': user.disabled,
-            'created_at': datetime.fromtimestamp(user.user_metadata.creation_timestamp / 1000).isoformat() if user.user_metadata.creation_timestamp else None,
-            'last_sign_in': datetime.fromtimestamp(user.user_metadata.last_sign_in_timestamp / 1000).isoformat() if user.user_metadata.last_sign_in_timestamp else None,
+            'created_at': _millis_to_isoformat(metadata.creation_timestamp),
+            'last_sign_in': _millis_to_isoformat(metadata.last_sign_in_timestamp),
             'custom_claims': user.custom_claims or {}
         }
 
 
+@lru_cache(maxsize=4096)
+def _seconds_to_isoformat(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).isoformat()
+
+
+def _millis_to_isoformat(millis: Optional[int]) -> Optional[str]:
+    """
+    Format a Firebase millisecond timestamp as local ISO-8601
+
+    Same output as datetime.fromtimestamp(millis / 1000).isoformat(), with
+    the whole-second part cached since users listed together often share
+    creation or sign-in seconds.
+    """
+    if not millis:
+        return None
+    seconds, remainder = divmod(int(millis), 1000)
+    formatted = _seconds_to_isoformat(seconds)
+    return f"{formatted}.{remainder * 1000:06d}" if remainder else formatted
+
+
 # Singleton instance
 _auth_manager = None
 
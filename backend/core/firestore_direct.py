@@ -7,6 +7,7 @@ Eliminates corruption risk by making Firestore the primary data store.
 Features:
 - Batch uploads (500 documents at a time - Firestore limit)
 - Hash-based deduplication (uses property hash as document ID)
+- Unchanged listings skipped (content hash stored with each document)
 - Real-time updates (no file locking needed)
 - Automatic retry on failure
 - Per-site and aggregate collections
@@ -21,11 +22,18 @@ Usage:
 import os
 import sys
 import json
+import math
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
+from core.query_cache import invalidate_query_cache
+
 logger = logging.getLogger(__name__)
 
 # Lazy import Firebase (only when needed)
@@ -91,7 +99,20 @@ def _get_firestore_client():
 
 def _clean_value(value):
     """Clean value for Firestore (handle NaN, None, etc.)"""
-    import pandas as pd
+    # Exact built-in types first; pd.isna() is only needed for the rest
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is str:
+        return value.strip() if value else None
+    if value_type is int:
+        return value
+    if value_type is float:
+        if value != value:  # NaN
+            return None
+        return int(value) if value == int(value) else value
+    if value_type is list or value_type is dict:
+        return value
 
     if pd.isna(value):
         return None
@@ -108,6 +129,165 @@ def _clean_value(value):
     return value
 
 
+# Batch commits allowed in flight at once. Higher values risk Firestore
+# "Deadline Exceeded" errors under write contention.
+MAX_CONCURRENT_COMMITS = 8
+
+# Firestore rejects commit requests over 10 MiB; batches are flushed before
+# their estimated size passes this, leaving headroom for encoding overhead
+MAX_BATCH_BYTES = 9 * 1024 * 1024
+
+# Attempts per document before a BulkWriter write is reported as an error
+BULK_WRITER_MAX_ATTEMPTS = 5
+
+
+# Listing fields copied into every property document (in addition to
+# site_key, hash and the upload timestamps)
+UPLOAD_FIELDS = (
+    'title', 'price', 'price_per_sqm', 'price_per_bedroom', 'location',
+    'estate_name', 'property_type', 'bedrooms', 'bathrooms', 'toilets', 'bq',
+    'land_size', 'title_tag', 'description', 'promo_tags', 'initial_deposit',
+    'payment_plan', 'service_charge', 'launch_timeline', 'agent_name',
+    'contact_info', 'images', 'listing_url', 'source', 'scrape_timestamp',
+    'quality_score',
+)
+
+# UPLOAD_FIELDS that normally hold plain numbers
+NUMERIC_UPLOAD_FIELDS = frozenset({
+    'price', 'price_per_sqm', 'price_per_bedroom', 'bedrooms', 'bathrooms',
+    'toilets', 'bq', 'land_size', 'initial_deposit', 'service_charge',
+    'quality_score',
+})
+
+
+def _clean_present_value(value):
+    """_clean_value() for a value already known not to be missing"""
+    if isinstance(value, (int, float)):
+        return int(value) if value == int(value) else float(value)
+    if isinstance(value, str):
+        return value.strip() if value else None
+    return value
+
+
+def _clean_numeric_column(values: list) -> Optional[list]:
+    """
+    _clean_value() over a whole column of None, plain ints and finite floats.
+
+    Returns:
+        Cleaned values, or None if the column holds anything else (left to
+        the pd.isna() path and per-listing cleaning)
+    """
+    if not all(value is None or type(value) is float or type(value) is int for value in values):
+        return None
+    # NaN != NaN, so it drops out here along with None
+    present = [value for value in values if value is not None and value == value]
+    if present and not (-math.inf < min(present) and max(present) < math.inf):
+        return None
+    return [
+        value if type(value) is int
+        else None if value is None or value != value
+        else int(value) if value.is_integer() else value
+        for value in values
+    ]
+
+
+def _batch_columns(listings: List[Dict[str, Any]], site_key: str) -> tuple:
+    """
+    Pull UPLOAD_FIELDS out of a batch of listings and clean them column by
+    column.
+
+    Missing values (None, NaN, NaT) are found with one pd.isna() call per
+    column rather than one per field per listing. NUMERIC_UPLOAD_FIELDS
+    columns of plain numbers skip pandas altogether.
+
+    Returns:
+        (columns, failures): columns holds one list per UPLOAD_FIELDS entry
+        with a cleaned value per listing; failures maps the index of each
+        listing with a value that could not be cleaned (e.g. an infinite
+        price) to the error
+    """
+    columns = []
+    failures = {}
+    for field in UPLOAD_FIELDS:
+        if field == 'source':
+            values = [listing.get('source', site_key) for listing in listings]
+        else:
+            values = [listing.get(field) for listing in listings]
+        if field in NUMERIC_UPLOAD_FIELDS:
+            cleaned = _clean_numeric_column(values)
+            if cleaned is not None:
+                columns.append(cleaned)
+                continue
+        missing = pd.Series(values, dtype=object).isna().tolist()
+        try:
+            values = [
+                None if is_missing else _clean_present_value(value)
+                for value, is_missing in zip(values, missing)
+            ]
+        except Exception:
+            # Redo the column value by value so only the offending listings fail
+            cleaned = []
+            for index, (value, is_missing) in enumerate(zip(values, missing)):
+                try:
+                    cleaned.append(None if is_missing else _clean_present_value(value))
+                except Exception as e:
+                    failures.setdefault(index, e)
+                    cleaned.append(None)
+            values = cleaned
+        columns.append(values)
+    return columns, failures
+
+
+def _batch_coordinates(listings: List[Dict[str, Any]], failures: Dict[int, Exception]) -> list:
+    """
+    Firestore coordinates for each listing of a batch.
+
+    A listing's {'lat', 'lng'} dict becomes {'latitude', 'longitude'};
+    listings without both values get None. Listings whose lat or lng is
+    not a number also get None, and their error is added to failures
+    (keyed by index, as in _batch_columns()).
+    """
+    coordinates = [None] * len(listings)
+    for index, listing in enumerate(listings):
+        value = listing.get('coordinates')
+        if not value or not isinstance(value, dict):
+            continue
+        lat = value.get('lat')
+        lng = value.get('lng')
+        if not (lat and lng):
+            continue
+        # Scraped coordinates are normally floats already
+        if type(lat) is float and type(lng) is float:
+            coordinates[index] = {'latitude': lat, 'longitude': lng}
+            continue
+        try:
+            coordinates[index] = {'latitude': float(lat), 'longitude': float(lng)}
+        except (TypeError, ValueError) as e:
+            failures.setdefault(index, e)
+    return coordinates
+
+
+def _json_encode(content: Dict[str, Any]) -> bytes:
+    """Compact, key-sorted JSON encoding (stdlib)"""
+    return json.dumps(content, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False, default=str).encode('utf-8')
+
+
+# orjson is optional; encoding falls back to the stdlib encoder
+try:
+    import orjson
+
+    def _encode_content(content: Dict[str, Any]) -> bytes:
+        """Compact, key-sorted JSON encoding of document content"""
+        try:
+            return orjson.dumps(content, default=str, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return _json_encode(content)
+except ImportError:
+    _encode_content = _json_encode
+
+
 class FirestoreUploader:
     """
     Direct Firestore uploader for property listings.
@@ -134,6 +314,14 @@ class FirestoreUploader:
                 self.enabled = False
                 logger.warning("Firestore upload disabled (initialization failed)")
 
+        if self.db is not None:
+            # Resolved once; every upload and metadata write reuses them
+            from google.cloud.firestore import SERVER_TIMESTAMP
+            self._server_timestamp = SERVER_TIMESTAMP
+            self._properties = self.db.collection('properties')
+            self._site_metadata = self.db.collection('site_metadata')
+            self._aggregates = self.db.collection('aggregates')
+
     def upload_listings_batch(
         self,
         site_key: str,
@@ -143,116 +331,54 @@ class FirestoreUploader:
         """
         Upload listings to Firestore in batches.
 
+        Set RP_FIRESTORE_BULK_WRITER=1 to write through the client's
+        BulkWriter instead of hand-built write batches.
+
         Args:
             site_key: Site identifier (e.g., 'cwlagos', 'npc')
             listings: List of cleaned, normalized listings
             batch_size: Firestore batch limit (max 500)
 
         Returns:
-            Dict with upload stats: {uploaded, errors, skipped, total}
+            Dict with upload stats: {uploaded, errors, skipped, unchanged, total}
         """
         if not self.enabled or self.db is None:
             logger.debug(f"{site_key}: Firestore upload disabled")
-            return {'uploaded': 0, 'errors': 0, 'skipped': 0, 'total': len(listings)}
+            return {'uploaded': 0, 'errors': 0, 'skipped': 0, 'unchanged': 0, 'total': len(listings)}
 
         if not listings:
             logger.info(f"{site_key}: No listings to upload to Firestore")
-            return {'uploaded': 0, 'errors': 0, 'skipped': 0, 'total': 0}
-
-        # Import SERVER_TIMESTAMP
-        from google.cloud.firestore import SERVER_TIMESTAMP
+            return {'uploaded': 0, 'errors': 0, 'skipped': 0, 'unchanged': 0, 'total': 0}
 
         logger.info(f"{site_key}: Uploading {len(listings)} listings to Firestore...")
 
-        collection_ref = self.db.collection('properties')
-        uploaded = 0
-        errors = 0
-        skipped = 0
-
-        # Process in batches (Firestore limit: 500 operations per batch)
-        for i in range(0, len(listings), batch_size):
-            batch_listings = listings[i:i + batch_size]
-            batch = self.db.batch()
-            batch_ops = 0
-
-            for listing in batch_listings:
-                try:
-                    # Use hash as document ID (prevents duplicates automatically)
-                    doc_hash = listing.get('hash')
-                    if not doc_hash:
-                        logger.warning(f"{site_key}: Listing missing hash, skipping: {listing.get('title', 'No title')}")
-                        skipped += 1
-                        continue
-
-                    doc_ref = collection_ref.document(doc_hash)
-
-                    # Prepare document data
-                    doc_data = {
-                        'title': _clean_value(listing.get('title')),
-                        'price': _clean_value(listing.get('price')),
-                        'price_per_sqm': _clean_value(listing.get('price_per_sqm')),
-                        'price_per_bedroom': _clean_value(listing.get('price_per_bedroom')),
-                        'location': _clean_value(listing.get('location')),
-                        'estate_name': _clean_value(listing.get('estate_name')),
-                        'property_type': _clean_value(listing.get('property_type')),
-                        'bedrooms': _clean_value(listing.get('bedrooms')),
-                        'bathrooms': _clean_value(listing.get('bathrooms')),
-                        'toilets': _clean_value(listing.get('toilets')),
-                        'bq': _clean_value(listing.get('bq')),
-                        'land_size': _clean_value(listing.get('land_size')),
-                        'title_tag': _clean_value(listing.get('title_tag')),
-                        'description': _clean_value(listing.get('description')),
-                        'promo_tags': _clean_value(listing.get('promo_tags')),
-                        'initial_deposit': _clean_value(listing.get('initial_deposit')),
-                        'payment_plan': _clean_value(listing.get('payment_plan')),
-                        'service_charge': _clean_value(listing.get('service_charge')),
-                        'launch_timeline': _clean_value(listing.get('launch_timeline')),
-                        'agent_name': _clean_value(listing.get('agent_name')),
-                        'contact_info': _clean_value(listing.get('contact_info')),
-                        'images': _clean_value(listing.get('images')),
-                        'listing_url': _clean_value(listing.get('listing_url')),
-                        'source': _clean_value(listing.get('source', site_key)),
-                        'site_key': site_key,
-                        'scrape_timestamp': _clean_value(listing.get('scrape_timestamp')),
-                        'hash': doc_hash,
-                        'quality_score': _clean_value(listing.get('quality_score')),
-
-                        # Metadata
-                        'uploaded_at': SERVER_TIMESTAMP,
-                        'updated_at': SERVER_TIMESTAMP,
-                    }
-
-                    # Add coordinates if available
-                    coordinates = listing.get('coordinates')
-                    if coordinates and isinstance(coordinates, dict):
-                        lat = coordinates.get('lat')
-                        lng = coordinates.get('lng')
-                        if lat and lng:
-                            doc_data['coordinates'] = {
-                                'latitude': float(lat),
-                                'longitude': float(lng)
-                            }
-
-                    # Set document (merge=True updates existing, creates if not exists)
-                    batch.set(doc_ref, doc_data, merge=True)
-                    batch_ops += 1
+        collection_ref = self._properties
+        # Upload timestamps, the same in every document of this upload and
+        # left out of the content hash
+        shared_fields = {
+            'uploaded_at': self._server_timestamp,
+            'updated_at': self._server_timestamp,
+        }
 
-                except Exception as e:
-                    logger.error(f"{site_key}: Error preparing listing for Firestore: {e}")
-                    errors += 1
+        # Opt-in: listings whose content matches the content hash stored by
+        # an earlier upload are not rewritten. Their uploaded_at, updated_at
+        # and scrape_timestamp then keep the values of that earlier upload.
+        skip_unchanged = os.getenv('RP_FIRESTORE_SKIP_UNCHANGED', '0') == '1'
 
-            # Commit batch
-            if batch_ops > 0:
-                try:
-                    batch.commit()
-                    uploaded += batch_ops
-                    logger.info(f"{site_key}: Uploaded batch {i//batch_size + 1} ({batch_ops} listings)")
-                except Exception as e:
-                    logger.error(f"{site_key}: Batch commit failed: {e}")
-                    errors += batch_ops
+        # BulkWriter is opt-in; hand-built batches remain the default
+        if os.getenv('RP_FIRESTORE_BULK_WRITER', '0') == '1':
+            uploaded, errors, skipped, unchanged = self._upload_with_bulk_writer(
+                site_key, listings, collection_ref, shared_fields, skip_unchanged, batch_size)
+        else:
+            uploaded, errors, skipped, unchanged = self._upload_with_batches(
+                site_key, listings, collection_ref, shared_fields, skip_unchanged, batch_size)
 
         total = len(listings)
-        logger.info(f"{site_key}: Firestore upload complete - {uploaded}/{total} uploaded, {errors} errors, {skipped} skipped")
+        logger.info(f"{site_key}: Firestore upload complete - {uploaded}/{total} uploaded, {unchanged} unchanged, {errors} errors, {skipped} skipped")
+
+        # Cached query results in this process no longer reflect Firestore
+        if uploaded > 0:
+            invalidate_query_cache()
 
         # Trigger aggregate update hook (optional, non-blocking)
         if uploaded > 0 and os.getenv('FIRESTORE_AUTO_AGGREGATE', '0') == '1':
@@ -265,9 +391,196 @@ class FirestoreUploader:
             'uploaded': uploaded,
             'errors': errors,
             'skipped': skipped,
+            'unchanged': unchanged,
             'total': total
         }
 
+    def _prepare_documents(
+        self,
+        site_key: str,
+        listings: List[Dict[str, Any]],
+        collection_ref,
+        shared_fields: Dict[str, Any],
+        skip_unchanged: bool,
+        counts: Dict[str, int]
+    ) -> List[tuple]:
+        """
+        Build (doc_ref, doc_data, doc_bytes) for one slice of listings.
+
+        Each document carries a content_hash (MD5 of its key-sorted JSON
+        without the upload and scrape timestamps). With skip_unchanged, the
+        stored content hashes of this slice's documents are fetched and
+        listings whose content_hash matches are counted in
+        counts['unchanged'] and not returned.
+        Listings without a hash are counted in counts['skipped'] and
+        listings that fail to convert in counts['errors'].
+        """
+        # Use hash as document ID (prevents duplicates automatically)
+        hashed = []
+        for listing in listings:
+            doc_hash = listing.get('hash')
+            if not doc_hash:
+                logger.warning(f"{site_key}: Listing missing hash, skipping: {listing.get('title', 'No title')}")
+                counts['skipped'] += 1
+            elif not isinstance(doc_hash, str):
+                logger.error(f"{site_key}: Error preparing listing for Firestore: hash {doc_hash!r} is not a string")
+                counts['errors'] += 1
+            else:
+                hashed.append(listing)
+
+        # Every conversion that can fail happens here, column by column
+        columns, failures = _batch_columns(hashed, site_key)
+        coordinates = _batch_coordinates(hashed, failures)
+        doc_refs = [collection_ref.document(listing['hash']) for listing in hashed]
+        if skip_unchanged:
+            known_content = self.get_existing_content_hashes(site_key, doc_refs)
+        else:
+            known_content = {}
+        documents = []
+
+        # zip(*columns) yields each listing's cleaned fields as a tuple
+        for index, (listing, doc_ref, row, coords) in enumerate(
+                zip(hashed, doc_refs, zip(*columns), coordinates)):
+            if index in failures:
+                logger.error(f"{site_key}: Error preparing listing for Firestore: {failures[index]}")
+                counts['errors'] += 1
+                continue
+
+            doc_hash = listing['hash']
+            doc_data = dict(zip(UPLOAD_FIELDS, row))
+            doc_data['site_key'] = site_key
+            doc_data['hash'] = doc_hash
+            if coords is not None:
+                doc_data['coordinates'] = coords
+
+            # The scrape timestamp changes on every scrape, so it is left
+            # out of the content hash
+            scrape_timestamp = doc_data.pop('scrape_timestamp')
+            encoded = _encode_content(doc_data)
+            content_hash = hashlib.md5(encoded).hexdigest()
+            if known_content.get(doc_hash) == content_hash:
+                counts['unchanged'] += 1
+                continue
+
+            doc_data['scrape_timestamp'] = scrape_timestamp
+            doc_data['content_hash'] = content_hash
+            doc_data.update(shared_fields)
+            # Encoded content approximates the document size; the
+            # timestamps fit in MAX_BATCH_BYTES headroom
+            documents.append((doc_ref, doc_data, len(encoded)))
+
+        return documents
+
+    def _upload_with_batches(
+        self,
+        site_key: str,
+        listings: List[Dict[str, Any]],
+        collection_ref,
+        shared_fields: Dict[str, Any],
+        skip_unchanged: bool,
+        batch_size: int
+    ) -> tuple:
+        """
+        Upload with hand-built write batches of up to batch_size documents.
+
+        Returns:
+            (uploaded, errors, skipped, unchanged)
+        """
+        counts = {'errors': 0, 'skipped': 0, 'unchanged': 0}
+        uploaded = 0
+
+        # Process in batches (Firestore limit: 500 operations and 10 MiB per
+        # batch; a batch is committed early once it nears MAX_BATCH_BYTES).
+        # Commits are network-bound, so each batch is handed to a thread pool
+        # as soon as it is built and several round trips overlap.
+        pending = []
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_COMMITS,
+                                thread_name_prefix="firestore-commit") as executor:
+            def submit(batch, batch_ops):
+                pending.append((len(pending) + 1, batch_ops, executor.submit(batch.commit)))
+
+            for i in range(0, len(listings), batch_size):
+                documents = self._prepare_documents(
+                    site_key, listings[i:i + batch_size], collection_ref, shared_fields, skip_unchanged, counts)
+                if not documents:
+                    continue
+
+                batch = self.db.batch()
+                batch_ops = 0
+                batch_bytes = 0
+                for doc_ref, doc_data, doc_bytes in documents:
+                    if batch_ops and batch_bytes + doc_bytes > MAX_BATCH_BYTES:
+                        submit(batch, batch_ops)
+                        batch = self.db.batch()
+                        batch_ops = 0
+                        batch_bytes = 0
+
+                    # Set document (merge=True updates existing, creates if not exists)
+                    batch.set(doc_ref, doc_data, merge=True)
+                    batch_ops += 1
+                    batch_bytes += doc_bytes
+                submit(batch, batch_ops)
+
+            # Collect commit results in batch order
+            for batch_number, batch_ops, commit in pending:
+                try:
+                    commit.result()
+                    uploaded += batch_ops
+                    logger.info(f"{site_key}: Uploaded batch {batch_number} ({batch_ops} listings)")
+                except Exception as e:
+                    logger.error(f"{site_key}: Batch commit failed: {e}")
+                    counts['errors'] += batch_ops
+
+        return uploaded, counts['errors'], counts['skipped'], counts['unchanged']
+
+    def _upload_with_bulk_writer(
+        self,
+        site_key: str,
+        listings: List[Dict[str, Any]],
+        collection_ref,
+        shared_fields: Dict[str, Any],
+        skip_unchanged: bool,
+        chunk_size: int
+    ) -> tuple:
+        """
+        Upload through the client's BulkWriter (RP_FIRESTORE_BULK_WRITER=1).
+
+        BulkWriter batches, parallelizes and throttles writes itself and
+        retries failed writes with backoff, so listings are only sliced
+        into chunk_size pieces for cleaning. A write that still fails after
+        BULK_WRITER_MAX_ATTEMPTS attempts counts as an error.
+
+        Returns:
+            (uploaded, errors, skipped, unchanged)
+        """
+        counts = {'errors': 0, 'skipped': 0, 'unchanged': 0}
+        succeeded = []
+        failed = []
+
+        def on_write_error(error, bulk_writer) -> bool:
+            if error.attempts < BULK_WRITER_MAX_ATTEMPTS:
+                return True
+            logger.error(f"{site_key}: Write failed for {error.operation.reference.id}: {error.message}")
+            failed.append(error)
+            return False
+
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.on_write_result(lambda reference, result, writer: succeeded.append(reference))
+        bulk_writer.on_write_error(on_write_error)
+
+        try:
+            for i in range(0, len(listings), chunk_size):
+                documents = self._prepare_documents(
+                    site_key, listings[i:i + chunk_size], collection_ref, shared_fields, skip_unchanged, counts)
+                for doc_ref, doc_data, _ in documents:
+                    bulk_writer.set(doc_ref, doc_data, merge=True)
+        finally:
+            # Blocks until every queued write has succeeded or given up
+            bulk_writer.close()
+
+        logger.info(f"{site_key}: BulkWriter finished ({len(succeeded)} written, {len(failed)} failed)")
+        return len(succeeded), counts['errors'] + len(failed), counts['skipped'], counts['unchanged']
+
     def update_site_metadata(self, site_key: str, metadata: Dict[str, Any]):
         """
         Update site metadata in Firestore.
@@ -280,9 +593,8 @@ class FirestoreUploader:
             return
 
         try:
-            from google.cloud.firestore import SERVER_TIMESTAMP
-            doc_ref = self.db.collection('site_metadata').document(site_key)
-            metadata['updated_at'] = SERVER_TIMESTAMP
+            doc_ref = self._site_metadata.document(site_key)
+            metadata['updated_at'] = self._server_timestamp
             doc_ref.set(metadata, merge=True)
             logger.debug(f"{site_key}: Updated site metadata in Firestore")
         except Exception as e:
@@ -303,8 +615,9 @@ class FirestoreUploader:
             return set()
 
         try:
-            collection_ref = self.db.collection('properties')
-            query = collection_ref.where('site_key', '==', site_key).limit(limit)
+            collection_ref = self._properties
+            # Empty projection: only document IDs (the hashes) come back
+            query = collection_ref.where('site_key', '==', site_key).select([]).limit(limit)
             docs = query.stream()
 
             hashes = set()
@@ -318,6 +631,38 @@ class FirestoreUploader:
             logger.error(f"{site_key}: Failed to get existing hashes: {e}")
             return set()
 
+    def get_existing_content_hashes(self, site_key: str, doc_refs: List[Any]) -> Dict[str, str]:
+        """
+        Get the stored content hashes of the given property documents.
+
+        Args:
+            site_key: Site identifier (for logging)
+            doc_refs: Property document references to look up
+
+        Returns:
+            Dict of property hash -> content_hash (missing documents and
+            documents written before content hashes were stored are left out)
+        """
+        if not self.enabled or self.db is None or not doc_refs:
+            return {}
+
+        try:
+            content_hashes = {}
+            # Projection: only document IDs and content hashes come back
+            for doc in self.db.get_all(doc_refs, field_paths=['content_hash']):
+                if not doc.exists:
+                    continue
+                content_hash = (doc.to_dict() or {}).get('content_hash')
+                if content_hash:
+                    content_hashes[doc.id] = content_hash
+
+            logger.debug(f"{site_key}: Retrieved {len(content_hashes)} content hashes from Firestore")
+            return content_hashes
+
+        except Exception as e:
+            logger.error(f"{site_key}: Failed to get content hashes: {e}")
+            return {}
+
     def _trigger_aggregate_update(self, site_key: str):
         """
         Trigger aggregate update after successful upload (non-blocking).
@@ -332,15 +677,13 @@ class FirestoreUploader:
             return
 
         try:
-            from google.cloud.firestore import SERVER_TIMESTAMP
-
             # Mark dashboard aggregate as stale
-            self.db.collection('aggregates').document('_stale_marker').set({
+            self._aggregates.document('_stale_marker').set({
                 'dashboard': True,
                 'top_deals': True,
                 'newest_listings': True,
                 'last_upload_site': site_key,
-                'updated_at': SERVER_TIMESTAMP
+                'updated_at': self._server_timestamp
             }, merge=True)
 
             logger.debug(f"{site_key}: Marked aggregates as stale")
@@ -17,6 +17,7 @@ Schema Structure:
 - tags: Promotional and categorization tags
 """
 
+import json
 import os
 import logging
 import time
@@ -24,6 +25,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import hashlib
 
+from core.query_cache import invalidate_query_cache
+
 logger = logging.getLogger(__name__)
 
 # Initialize Firebase (lazy loading)
@@ -51,7 +54,6 @@ def _get_firestore_client():
     try:
         import firebase_admin
         from firebase_admin import credentials, firestore
-        import json
 
         # Check if Firebase is already initialized (by another module)
         if not firebase_admin._apps:
@@ -103,6 +105,21 @@ def _get_firestore_client():
 
 def _clean_value(value):
     """Clean value for Firestore (handle NaN, None, etc.)"""
+    # Exact built-in types first; pd.isna() is only needed for the rest
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is str:
+        return value.strip() if value else None
+    if value_type is int:
+        return value
+    if value_type is float:
+        if value != value:  # NaN
+            return None
+        return int(value) if value == int(value) else value
+    if value_type is list or value_type is dict:
+        return value
+
     import pandas as pd
 
     if pd.isna(value):
@@ -761,7 +778,10 @@ class EnterpriseFirestoreUploader:
         use_batch_writes = os.getenv('RP_FIRESTORE_BATCH', '0') == '1'
 
         if use_batch_writes:
-            return self._upload_with_batch_writes(site_key, listings, batch_size)
+            stats = self._upload_with_batch_writes(site_key, listings, batch_size)
+            if stats['uploaded'] > 0:
+                invalidate_query_cache()
+            return stats
 
         # Default: Individual uploads (safer, working method)
         logger.info(f"{site_key}: Using INDIVIDUAL UPLOADS (safe mode) for {len(listings)} listings...")
@@ -808,6 +828,10 @@ class EnterpriseFirestoreUploader:
         total = len(listings)
         logger.info(f"{site_key}: Individual upload complete - {uploaded}/{total} uploaded, {errors} errors, {skipped} skipped")
 
+        # Cached query results in this process no longer reflect Firestore
+        if uploaded > 0:
+            invalidate_query_cache()
+
         # Update site metadata
         try:
             self._update_site_metadata(site_key, uploaded)
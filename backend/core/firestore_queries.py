@@ -9,7 +9,7 @@ Features:
 - Flexible filtering (price, location, property type, bedrooms, etc.)
 - Pagination support
 - Aggregate statistics
-- Cached results for expensive queries
+- Cached results for expensive queries (see core/query_cache.py)
 
 Usage:
     from core.firestore_queries import (
@@ -37,6 +37,9 @@ from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from core.query_cache import cached_query
+from core.firestore_queries_enterprise import count_documents
+
 logger = logging.getLogger(__name__)
 
 # Lazy import Firestore
@@ -66,6 +69,7 @@ def _doc_to_dict(doc) -> Dict[str, Any]:
 # TOP DEALS & NEWEST LISTINGS
 # ============================================================================
 
+@cached_query
 def get_cheapest_properties(
     limit: int = 100,
     min_quality_score: float = 0.0,
@@ -116,6 +120,7 @@ def get_cheapest_properties(
         return []
 
 
+@cached_query
 def get_newest_listings(
     limit: int = 50,
     days_back: int = 7,
@@ -383,7 +388,7 @@ def search_properties(
     Returns:
         Dict with:
             - results: List of property dicts
-            - total: Total count (if available)
+            - total: Number of properties matching the filters
             - has_more: Boolean indicating more results available
     """
     db = _get_firestore_client()
@@ -419,6 +424,9 @@ def search_properties(
         if 'quality_score_min' in filters and filters['quality_score_min']:
             query = query.where('quality_score', '>=', filters['quality_score_min'])
 
+        # Filtered query before sorting and pagination, for the total count
+        count_query = query
+
         # Sort
         direction = 'DESCENDING' if sort_desc else 'ASCENDING'
         query = query.order_by(sort_by, direction=direction)
@@ -432,10 +440,17 @@ def search_properties(
         has_more = len(docs) > limit
         results = [_doc_to_dict(doc) for doc in docs[:limit]]
 
-        logger.info(f"Search returned {len(results)} properties")
+        # Server-side COUNT aggregation: no matching documents are streamed
+        try:
+            total = count_documents(count_query)
+        except Exception as e:
+            logger.warning(f"Search count failed, reporting page size as total: {e}")
+            total = len(results)
+
+        logger.info(f"Search returned {len(results)} of {total} properties")
         return {
             'results': results,
-            'total': len(results),  # Firestore doesn't support COUNT in query
+            'total': total,
             'has_more': has_more
         }
 
@@ -481,6 +496,7 @@ def get_site_properties(
 # DASHBOARD STATISTICS
 # ============================================================================
 
+@cached_query
 def get_dashboard_stats() -> Dict[str, Any]:
     """
     Get aggregate statistics for dashboard (replaces _Dashboard sheet).
@@ -5,11 +5,15 @@ This module provides optimized query functions for the nested enterprise schema.
 All functions support the new schema structure with nested categories.
 """
 
+import json
 import os
 import logging
+from collections import Counter
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, timezone
 
+from core.query_cache import cached_query
+
 logger = logging.getLogger(__name__)
 
 # Initialize Firebase (lazy loading)
@@ -132,7 +136,6 @@ def _get_firestore_client():
                 firebase_admin.initialize_app(cred)
                 logger.info(f"Firestore initialized from: {service_account_path}")
             elif credentials_json:
-                import json
                 cred_dict = json.loads(credentials_json)
                 cred = credentials.Certificate(cred_dict)
                 firebase_admin.initialize_app(cred)
@@ -153,6 +156,60 @@ def _get_firestore_client():
         return None
 
 
+def count_documents(query) -> int:
+    """
+    Count documents matching a query or collection reference.
+
+    Uses a server-side count() aggregation, so only the total is transferred
+    and billed instead of one read per document. Falls back to streaming
+    bare document IDs on client versions without aggregation support.
+
+    Args:
+        query: Firestore Query or CollectionReference
+
+    Returns:
+        Number of matching documents
+    """
+    try:
+        aggregation = query.count()
+    except AttributeError:
+        return sum(1 for _ in query.select([]).stream())
+
+    return int(aggregation.get()[0][0].value)
+
+
+STREAM_PAGE_SIZE = 300
+
+
+def stream_in_pages(query, page_size: int = STREAM_PAGE_SIZE):
+    """
+    Stream every document of a query in explicit cursor-paginated pages.
+
+    Orders by document ID and fetches ``page_size`` documents per request,
+    resuming with start_after() from the last snapshot, so large collections
+    are read in a few large round trips instead of the client's default
+    paging. Intended for unordered full scans.
+
+    Args:
+        query: Firestore Query or CollectionReference (optionally with select())
+        page_size: Documents fetched per request
+
+    Yields:
+        DocumentSnapshot objects
+    """
+    query = query.order_by('__name__').limit(page_size)
+    last_doc = None
+
+    while True:
+        page_query = query.start_after(last_doc) if last_doc is not None else query
+        docs = list(page_query.stream())
+        yield from docs
+
+        if len(docs) < page_size:
+            return
+        last_doc = docs[-1]
+
+
 def get_properties_by_status(
     status: str = 'available',
     limit: int = 100,
@@ -218,23 +275,41 @@ def get_properties_by_listing_type(
 
     try:
         import firebase_admin.firestore as firestore
+        from google.api_core.exceptions import FailedPrecondition
         properties_ref = db.collection('properties')
 
-        # Only order by uploaded_at to avoid composite index requirement
-        # Filter by listing_type and status in post-processing
-        query = properties_ref.order_by('uploaded_at', direction=firestore.Query.DESCENDING)
-
-        # Fetch ALL documents from Firestore (no limit)
-        # This ensures accurate total count and pagination
-        # Execute query
-        all_results = [_clean_property_dict(doc.to_dict()) for doc in query.stream()]
+        # listing_type/status are filtered server-side via the
+        # (listing_type, status, uploaded_at) composite index
+        query = properties_ref.where('basic_info.listing_type', '==', listing_type) \
+                             .where('basic_info.status', '==', 'available') \
+                             .order_by('uploaded_at', direction=firestore.Query.DESCENDING)
 
-        # Filter by listing_type in post-processing
-        all_results = [
-            p for p in all_results
-            if p.get('basic_info', {}).get('listing_type') == listing_type
-            and p.get('basic_info', {}).get('status') == 'available'
-        ]
+        try:
+            # Without post-processing filters the total comes from a count()
+            # aggregation and only the requested page is fetched
+            if not (price_min is not None and price_min > 0) and price_max is None and min_quality_score <= 0:
+                total_count = count_documents(query)
+                page_query = query.offset(offset) if offset > 0 else query
+                results = [_clean_property_dict(doc.to_dict()) for doc in page_query.limit(limit).stream()]
+                logger.info(f"Retrieved {len(results)}/{total_count} {listing_type} properties (offset={offset})")
+                return {
+                    'properties': results,
+                    'total': total_count
+                }
+
+            all_results = [_clean_property_dict(doc.to_dict()) for doc in query.stream()]
+
+        except FailedPrecondition as e:
+            # Composite index not deployed yet (firebase deploy --only
+            # firestore:indexes): order by uploaded_at only and filter
+            # listing_type/status in post-processing
+            logger.warning(f"Listing type index unavailable, filtering in memory: {e}")
+            query = properties_ref.order_by('uploaded_at', direction=firestore.Query.DESCENDING)
+            all_results = [
+                p for p in (_clean_property_dict(doc.to_dict()) for doc in query.stream())
+                if p.get('basic_info', {}).get('listing_type') == listing_type
+                and p.get('basic_info', {}).get('status') == 'available'
+            ]
 
         # Filter by price in post-processing
         if price_min is not None and price_min > 0:
@@ -562,6 +637,7 @@ def get_new_on_market(days: int = 7, limit: int = 100) -> List[Dict[str, Any]]:
         return []
 
 
+@cached_query
 def get_cheapest_properties(
     limit: int = 100,
     min_quality_score: float = 0.0,
@@ -603,6 +679,7 @@ def get_cheapest_properties(
         return []
 
 
+@cached_query
 def get_newest_listings(
     limit: int = 50,
     days_back: int = 30,
@@ -745,6 +822,7 @@ def get_property_by_hash(property_hash: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+@cached_query
 def get_dashboard_stats() -> Dict[str, Any]:
     """
     Get dashboard statistics.
@@ -779,62 +857,70 @@ def get_dashboard_stats() -> Dict[str, Any]:
         # Calculate fresh stats
         properties_ref = db.collection('properties')
 
-        # Get all available properties (may be slow for large collections)
-        all_props = list(properties_ref.where('basic_info.status', '==', 'available').stream())
-
-        if not all_props:
-            return {
-                'total_properties': 0,
-                'updated_at': datetime.now(timezone.utc)
-            }
-
-        # Calculate stats
-        prices = []
-        by_type = {}
-        by_listing_type = {}
-        by_area = {}
+        # Single streamed pass over available properties; tallies are kept
+        # as counters so no documents are held in memory
+        total = 0
+        price_count = 0
+        price_sum = 0
+        price_min = None
+        price_max = None
+        by_type = Counter()
+        by_listing_type = Counter()
+        by_area = Counter()
         premium_count = 0
 
-        for doc in all_props:
+        for doc in properties_ref.where('basic_info.status', '==', 'available').stream():
             data = doc.to_dict()
+            total += 1
 
             # Price stats
-            price = data.get('financial', {}).get('price')
+            price = (data.get('financial') or {}).get('price')
             if price:
-                prices.append(price)
+                price_count += 1
+                price_sum += price
+                if price_min is None or price < price_min:
+                    price_min = price
+                if price_max is None or price > price_max:
+                    price_max = price
 
             # Type breakdown
-            prop_type = data.get('property_details', {}).get('property_type')
+            prop_type = (data.get('property_details') or {}).get('property_type')
             if prop_type:
-                by_type[prop_type] = by_type.get(prop_type, 0) + 1
+                by_type[prop_type] += 1
 
             # Listing type breakdown
-            listing_type = data.get('basic_info', {}).get('listing_type')
+            listing_type = (data.get('basic_info') or {}).get('listing_type')
             if listing_type:
-                by_listing_type[listing_type] = by_listing_type.get(listing_type, 0) + 1
+                by_listing_type[listing_type] += 1
 
             # Area breakdown
-            area = data.get('location', {}).get('area')
+            area = (data.get('location') or {}).get('area')
             if area:
-                by_area[area] = by_area.get(area, 0) + 1
+                by_area[area] += 1
 
             # Premium count
-            if data.get('tags', {}).get('premium'):
+            if (data.get('tags') or {}).get('premium'):
                 premium_count += 1
 
+        if not total:
+            return {
+                'total_properties': 0,
+                'updated_at': datetime.now(timezone.utc)
+            }
+
         stats = {
-            'total_properties': len(all_props),
+            'total_properties': total,
             'total_for_sale': by_listing_type.get('sale', 0),
             'total_for_rent': by_listing_type.get('rent', 0),
             'premium_properties': premium_count,
             'price_range': {
-                'min': min(prices) if prices else 0,
-                'max': max(prices) if prices else 0,
-                'avg': sum(prices) / len(prices) if prices else 0
+                'min': price_min if price_count else 0,
+                'max': price_max if price_count else 0,
+                'avg': price_sum / price_count if price_count else 0
             },
-            'by_property_type': by_type,
-            'by_listing_type': by_listing_type,
-            'top_areas': dict(sorted(by_area.items(), key=lambda x: x[1], reverse=True)[:10]),
+            'by_property_type': dict(by_type),
+            'by_listing_type': dict(by_listing_type),
+            'top_areas': dict(by_area.most_common(10)),
             'updated_at': datetime.now(timezone.utc)
         }
 
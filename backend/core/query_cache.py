@@ -0,0 +1,76 @@
+"""
+core/query_cache.py
+
+Short-lived in-process cache for Firestore query helpers.
+
+Dashboard endpoints call the same query helpers with the same arguments on
+every page load; each call is a full Firestore round trip. Wrapping a helper
+with @cached_query lets identical calls within QUERY_CACHE_TTL seconds share
+one result. The cache is per process: uploads call invalidate_query_cache(),
+but they run in the scraper process, where nothing is cached, so the API
+process serves results up to QUERY_CACHE_TTL seconds old.
+
+Usage:
+    from core.query_cache import cached_query
+
+    @cached_query
+    def get_cheapest_properties(limit: int = 100) -> List[Dict[str, Any]]:
+        ...
+
+Set RP_QUERY_CACHE_TTL=0 to disable caching.
+"""
+
+import os
+import copy
+from functools import wraps
+from typing import Callable
+
+from core.ttl_cache import TTLCache
+
+# Seconds a cached result is reused
+QUERY_CACHE_TTL = float(os.getenv('RP_QUERY_CACHE_TTL', '30'))
+# Entries kept at most; expired entries are dropped first when full
+QUERY_CACHE_MAX = 128
+
+# (function, args, kwargs) -> result
+_query_cache = TTLCache(QUERY_CACHE_TTL, QUERY_CACHE_MAX)
+
+
+def invalidate_query_cache() -> None:
+    """Drop every cached query result (called after successful uploads)"""
+    _query_cache.clear()
+
+
+def cached_query(func: Callable) -> Callable:
+    """
+    Reuse func's result for identical arguments for QUERY_CACHE_TTL seconds.
+
+    Empty results are not cached, since the query helpers also return them
+    on errors. Results are deep-copied in and out of the cache so callers
+    may modify what they get back. Calls with unhashable arguments are
+    passed straight through.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if QUERY_CACHE_TTL <= 0:
+            return func(*args, **kwargs)
+
+        try:
+            call_key = (func.__module__, func.__qualname__, args, frozenset(kwargs.items()))
+            hash(call_key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        # Read before querying: results computed across an invalidation
+        # are not stored
+        generation = _query_cache.generation
+        cached = _query_cache.get(call_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = func(*args, **kwargs)
+        if result:
+            _query_cache.put(call_key, copy.deepcopy(result), generation=generation)
+        return result
+
+    return wrapper
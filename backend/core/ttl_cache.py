@@ -0,0 +1,92 @@
+"""
+core/ttl_cache.py
+
+Small thread-safe in-process cache whose entries expire after a TTL.
+
+Shared by the token, user and query caches. When the cache is full,
+expired entries are dropped first; if it is still full, everything is
+dropped, which keeps puts O(1) amortized without tracking access order.
+
+Usage:
+    from core.ttl_cache import TTLCache
+
+    _token_cache = TTLCache(ttl=30, max_size=10000)
+
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = verify(token)
+        # Never cache past the token's own expiry
+        _token_cache.put(key, payload, expires_at=payload.get('exp'))
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe dict cache with per-entry expiry and a size cap"""
+
+    def __init__(self, ttl: float, max_size: int):
+        """
+        Args:
+            ttl: Seconds an entry is kept at most
+            max_size: Entries kept at most
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        # Bumped by clear(); puts made for an older generation are dropped
+        self.generation = 0
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        """
+        Cache value under key for ttl seconds
+
+        Args:
+            key: Cache key
+            value: Value to cache (must not be None)
+            expires_at: Optional epoch time the entry must not outlive
+            generation: If given, the value is dropped when clear() has been
+                called since that generation was read
+        """
+        now = time.time()
+        expiry = now + self.ttl
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if len(self._entries) >= self.max_size:
+                for stale in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                    del self._entries[stale]
+                if len(self._entries) >= self.max_size:
+                    self._entries.clear()
+            self._entries[key] = (expiry, value)
+
+    def discard_if(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry for which predicate(key, value) is true"""
+        with self._lock:
+            for key in [k for k, (_, value) in self._entries.items() if predicate(k, value)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry and start a new generation"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
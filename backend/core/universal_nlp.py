@@ -60,6 +60,12 @@ AMENITY_KEYWORDS = {
     'others': ['air conditioning', 'ac', 'wardrobes', 'bq', 'boys quarters', 'study room']
 }
 
+# Flattened, de-duplicated amenity keywords in category order, built once at
+# import so extraction is a single pass of substring checks
+_AMENITY_KEYWORDS_FLAT = tuple(dict.fromkeys(
+    keyword for keywords in AMENITY_KEYWORDS.values() for keyword in keywords
+))
+
 
 def extract_location_with_nlp(text: str) -> Optional[str]:
     """
@@ -115,8 +121,11 @@ def classify_property_type(text: str) -> Optional[str]:
     Returns:
         Property type string, or None if not determined
     """
-    text_lower = text.lower()
+    return _classify_lowered(text.lower())
+
 
+def _classify_lowered(text_lower: str) -> Optional[str]:
+    """classify_property_type() on text that is already lowercased."""
     # Check each property type
     for property_type, keywords in PROPERTY_TYPE_KEYWORDS.items():
         for keyword in keywords:
@@ -136,24 +145,12 @@ def extract_amenities(text: str) -> List[str]:
     Returns:
         List of amenity strings
     """
-    text_lower = text.lower()
-    found_amenities = []
-
-    # Check all amenity categories
-    for category, keywords in AMENITY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                found_amenities.append(keyword)
+    return _extract_amenities_lowered(text.lower())
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_amenities = []
-    for amenity in found_amenities:
-        if amenity not in seen:
-            seen.add(amenity)
-            unique_amenities.append(amenity)
 
-    return unique_amenities
+def _extract_amenities_lowered(text_lower: str) -> List[str]:
+    """extract_amenities() on text that is already lowercased."""
+    return [keyword for keyword in _AMENITY_KEYWORDS_FLAT if keyword in text_lower]
 
 
 def extract_key_phrases(text: str, limit: int = 10) -> List[str]:
@@ -11,7 +11,9 @@ import hashlib
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from filelock import FileLock
 
 from core.config_loader import load_config, ConfigValidationError
 from core.dispatcher import get_parser
@@ -79,12 +81,28 @@ GLOBAL_SEARCH = os.getenv("RP_SEARCH", "").strip()
 FILTERS = {"search_query": GLOBAL_SEARCH} if GLOBAL_SEARCH else {}
 
 # ---------------- SITE CONFIGURATION (loaded from config.yaml) ----------------
-# Get enabled sites from config
-ENABLED_SITES = CONFIG.get_enabled_sites()
-total_sites, enabled_count = CONFIG.count_sites()
+def select_sites(site_keys: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Sites to scrape: the given site keys if provided (regardless of their
+    `enabled` flag), otherwise the sites enabled in config.yaml.
+    """
+    if not site_keys:
+        return CONFIG.get_enabled_sites()
+
+    all_sites = CONFIG.get_all_sites()
+    for key in site_keys:
+        if key not in all_sites:
+            logging.warning(f"Unknown site '{key}' ignored")
+    return {key: all_sites[key] for key in site_keys if key in all_sites}
+
+# Get enabled sites: RP_ENABLED_SITES (set per batch by the API scraper manager)
+# takes precedence over the `enabled` flags in config.yaml
+RP_ENABLED_SITES = [s.strip() for s in os.getenv("RP_ENABLED_SITES", "").split(",") if s.strip()]
+ENABLED_SITES = select_sites(RP_ENABLED_SITES)
+total_sites, enabled_count = len(CONFIG.get_all_sites()), len(ENABLED_SITES)
 disabled_count = total_sites - enabled_count
 
-logging.info(f"Loaded {enabled_count} enabled sites from config.yaml")
+logging.info(f"Loaded {enabled_count} enabled sites from {'RP_ENABLED_SITES' if RP_ENABLED_SITES else 'config.yaml'}")
 if disabled_count > 0:
     logging.warning(f"{disabled_count} sites are disabled and will be skipped")
 
@@ -141,6 +159,8 @@ def try_scrape_with_retry(site_key: str, site_config: Dict) -> list:
 
 # ---------------- METADATA TRACKING ----------------
 METADATA_FILE = Path("logs/site_metadata.json")
+# Held around load-update-save so concurrent batch processes serialize
+METADATA_LOCK_FILE = Path("logs/site_metadata.json.lock")
 
 def load_metadata() -> Dict:
     """Load site metadata (last successful scrape times, etc.)"""
@@ -153,13 +173,19 @@ def load_metadata() -> Dict:
     return {}
 
 def save_metadata(metadata: Dict) -> None:
-    """Save site metadata to disk."""
+    """Save site metadata to disk (temp file + rename, so readers never see a partial file)."""
+    tmp_path = f"{METADATA_FILE}.tmp.{os.getpid()}"
     try:
         METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(METADATA_FILE, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, METADATA_FILE)
     except Exception as e:
         logging.warning(f"Failed to save metadata: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 def update_site_metadata(metadata: Dict, site_key: str, count: int) -> None:
     """Update metadata for a site after scraping."""
@@ -268,8 +294,17 @@ def run_site(site_key: str, site_config: Dict) -> Tuple[int, str]:
     return len(geocoded), base_url
 
 # ---------------- MAIN ----------------
-def main() -> None:
+def main(sites: Optional[List[str]] = None) -> None:
+    """
+    Run a scrape.
+
+    Args:
+        sites: Site keys to scrape (default: RP_ENABLED_SITES or the
+            sites enabled in config.yaml). Used by the API batch worker,
+            which imports this module once and calls main() per batch.
+    """
     logging.info("Realtors Practice Scraper Entry\n")
+    enabled_sites = select_sites(sites) if sites else ENABLED_SITES
 
     # Log config summary
     logging.info("=== CONFIGURATION SUMMARY ===")
@@ -281,14 +316,11 @@ def main() -> None:
     logging.info(f"Browser: headless={GLOBAL_SETTINGS['browser']['headless']}, block_images={GLOBAL_SETTINGS['browser']['block_images']}")
     logging.info("=============================\n")
 
-    # Load metadata
-    metadata = load_metadata()
-
     # Prepare sites for scraping
     valid_sites = []
     skipped_sites = []
 
-    for site_key, site_config in ENABLED_SITES.items():
+    for site_key, site_config in enabled_sites.items():
         if not site_config.get("url"):
             logging.warning(f"{site_key}: No URL configured, skipping")
             skipped_sites.append(site_key)
@@ -328,12 +360,15 @@ def main() -> None:
     for site_key in skipped_sites:
         summary[site_key] = (0, "")
 
-    # Update metadata for all sites
-    for site_key, (count, url) in summary.items():
-        update_site_metadata(metadata, site_key, count)
-
-    # Save metadata
-    save_metadata(metadata)
+    # Update metadata for all sites. Concurrent batch processes
+    # (RP_BATCH_PARALLELISM>1) share the file, so load-update-save runs under
+    # a file lock to keep one batch from dropping another's updates
+    METADATA_LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(str(METADATA_LOCK_FILE)):
+        metadata = load_metadata()
+        for site_key, (count, url) in summary.items():
+            update_site_metadata(metadata, site_key, count)
+        save_metadata(metadata)
 
     # Final report
     logging.info("\n=== SCRAPE REPORT ===")
@@ -11,8 +11,8 @@ Usage:
     # Actually delete category pages
     python scripts/cleanup_category_pages.py --delete
 
-    # Export to JSON before deleting
-    python scripts/cleanup_category_pages.py --delete --export cleanup_backup.json
+    # Export to JSON Lines before deleting
+    python scripts/cleanup_category_pages.py --delete --export cleanup_backup.jsonl
 
 Author: Claude Sonnet 4.5
 Date: 2025-12-25
@@ -23,6 +23,9 @@ import os
 import argparse
 import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Tuple
 from datetime import datetime
 
@@ -30,8 +33,27 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Import Firestore modules
+from google.api_core.exceptions import Aborted, DeadlineExceeded, ServiceUnavailable
 from core.firestore_enterprise import _get_firestore_client
-from core.firestore_queries_enterprise import get_all_properties
+from core.firestore_queries_enterprise import STREAM_PAGE_SIZE, _clean_property_dict, stream_in_pages
+
+# pandas is optional; without it detection runs per property
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+# orjson is optional; fall back to stdlib json with the same bytes interface
+try:
+    import orjson
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, default=str) + '\n').encode('utf-8')
 
 # Import universal detector (not strictly needed since we use heuristics)
 # from core.universal_detector import is_category_page, get_detection_confidence
@@ -43,6 +65,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Firestore allows at most 500 writes per batch
+DELETE_BATCH_SIZE = 500
+
+# Only the fields detection, title defaults, logging and deletion read;
+# full documents are fetched just for the pages being backed up
+DETECTION_FIELDS = [
+    'basic_info.url',
+    'basic_info.title',
+    'financial.price',
+    'property_details.bedrooms',
+    'property_details.bathrooms',
+    'property_details.property_type',
+    'location.area',
+    'metadata.hash',
+]
+
+# Concurrent batch commits when deleting
+DELETE_WORKERS = 40
+
+# Shared read-only stand-in for missing nested sections
+_EMPTY = {}
+
+# URL fragments that indicate a listing/category page rather than a property
+CATEGORY_URL_PATTERNS = (
+    '/property-location/', '/listings/', '/search/', '/properties/',
+    '/category/', '/location/', '/area/', '/city/', '/state/',
+    '/browse/', '/filter/', '/results/'
+)
+CATEGORY_URL_RE = re.compile('|'.join(map(re.escape, CATEGORY_URL_PATTERNS)), re.IGNORECASE)
+
+# Titles that are just a location name
+GENERIC_LOCATION_NAMES = frozenset({
+    'Chevron', 'Ikate', 'Lekki', 'Victoria Island', 'Ikoyi', 'Ajah',
+    'Ikeja', 'Yaba', 'Surulere', 'Maryland', 'Magodo', 'Lagos',
+    'Nigeria', 'VI', 'VGC', 'Osapa', 'Sangotedo'
+})
+
+
+def _category_signals(prop: Dict) -> Dict:
+    """
+    Compute category-page heuristics for a single property.
+
+    Args:
+        prop: Property dictionary from Firestore
+
+    Returns:
+        Dict of heuristic flags plus the combined category_score
+    """
+    # Extract data for detection (look up each nested section once)
+    basic_info = prop.get('basic_info') or _EMPTY
+    financial = prop.get('financial') or _EMPTY
+    details = prop.get('property_details') or _EMPTY
+
+    url = basic_info.get('url', '')
+    title = basic_info.get('title', '')
+    price = financial.get('price', 0)
+
+    # Note: We don't have HTML content, so we'll use heuristics
+    # Heuristic 1: URL patterns
+    url_is_category = CATEGORY_URL_RE.search(url) is not None
+
+    # Heuristic 2: Generic title (just location name)
+    title_is_generic = title.strip() in GENERIC_LOCATION_NAMES
+
+    # Heuristic 3: Missing critical fields
+    missing_price = not price or price == 0
+    missing_details = not details.get('bedrooms') and not details.get('bathrooms')
+
+    # Heuristic 4: Very short title
+    title_too_short = len(title) < 10
+
+    return {
+        'url_is_category': url_is_category,
+        'title_is_generic': title_is_generic,
+        'missing_price': missing_price,
+        'missing_details': missing_details,
+        'title_too_short': title_too_short,
+        'category_score': (3 * url_is_category + 2 * title_is_generic + 2 * missing_price
+                           + missing_details + title_too_short),
+    }
+
+
+def _category_signals_frame(properties: List[Dict]) -> "pd.DataFrame":
+    """
+    Vectorized equivalent of _category_signals over a whole batch.
+
+    Pulls only the five fields the heuristics need into a narrow DataFrame
+    and evaluates every heuristic as a column mask instead of per-property
+    branching.
+
+    Args:
+        properties: List of property dictionaries from Firestore
+
+    Returns:
+        DataFrame of heuristic flags plus category_score, one row per
+        property in input order
+    """
+    rows = []
+    for prop in properties:
+        basic_info = prop.get('basic_info') or _EMPTY
+        details = prop.get('property_details') or _EMPTY
+        rows.append((
+            basic_info.get('url'),
+            basic_info.get('title'),
+            (prop.get('financial') or _EMPTY).get('price'),
+            details.get('bedrooms'),
+            details.get('bathrooms'),
+        ))
+
+    df = pd.DataFrame.from_records(rows, columns=['url', 'title', 'price', 'bedrooms', 'bathrooms'])
+
+    url = df['url'].fillna('').astype(str)
+    title = df['title'].fillna('').astype(str)
+
+    signals = pd.DataFrame({
+        'url_is_category': url.str.contains(CATEGORY_URL_RE),
+        'title_is_generic': title.str.strip().isin(GENERIC_LOCATION_NAMES),
+        'missing_price': ~df['price'].fillna(0).astype(bool),
+        'missing_details': (~df['bedrooms'].fillna(0).astype(bool)
+                            & ~df['bathrooms'].fillna(0).astype(bool)),
+        'title_too_short': title.str.len() < 10,
+    })
+    signals['category_score'] = (3 * signals['url_is_category'].astype(int)
+                                 + 2 * signals['title_is_generic'].astype(int)
+                                 + 2 * signals['missing_price'].astype(int)
+                                 + signals['missing_details'].astype(int)
+                                 + signals['title_too_short'].astype(int))
+    return signals
+
+
+def _frame_signals(signals: "pd.DataFrame") -> Tuple[List[int], Dict[int, Dict]]:
+    """
+    Split a signals DataFrame into per-row scores and full signal dicts.
+
+    Full dicts are only built for rows at or above the category threshold,
+    since only those are stored as detection info.
+
+    Returns:
+        Tuple of (scores in input order, {row index: signal dict} for flagged rows)
+    """
+    scores = signals['category_score'].tolist()
+    flagged = signals[signals['category_score'] >= 4].to_dict('index')
+    flagged = {
+        index: {key: (int(value) if key == 'category_score' else bool(value)) for key, value in row.items()}
+        for index, row in flagged.items()
+    }
+    return scores, flagged
+
 
 def identify_category_pages(properties: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
     """
@@ -59,86 +229,29 @@ def identify_category_pages(properties: List[Dict]) -> Tuple[List[Dict], List[Di
 
     logger.info(f"Analyzing {len(properties)} properties for category page detection...")
 
+    scores = flagged = None
+    if HAS_PANDAS and properties:
+        try:
+            scores, flagged = _frame_signals(_category_signals_frame(properties))
+        except Exception as e:
+            logger.warning(f"Vectorized detection failed, falling back to per-property checks: {e}")
+
     for i, prop in enumerate(properties, 1):
         try:
-            # Extract data for detection
-            url = prop.get('basic_info', {}).get('url', '')
-            title = prop.get('basic_info', {}).get('title', '')
-            price = prop.get('financial', {}).get('price', 0)
-            location = prop.get('location', {}).get('area', '')
-
-            # Create extracted_data dict
-            extracted_data = {
-                'url': url,
-                'title': title,
-                'price': price,
-                'location': location,
-                'bedrooms': prop.get('property_details', {}).get('bedrooms'),
-                'bathrooms': prop.get('property_details', {}).get('bathrooms')
-            }
-
-            # Note: We don't have HTML content, so we'll use heuristics
-            # Check if property matches category page patterns
-            is_cat = False
-            signals = {}
-
-            # Heuristic 1: URL patterns
-            category_url_patterns = [
-                '/property-location/', '/listings/', '/search/', '/properties/',
-                '/category/', '/location/', '/area/', '/city/', '/state/',
-                '/browse/', '/filter/', '/results/'
-            ]
-
-            url_is_category = any(pattern in url.lower() for pattern in category_url_patterns)
-
-            # Heuristic 2: Generic title (just location name)
-            generic_location_names = [
-                'Chevron', 'Ikate', 'Lekki', 'Victoria Island', 'Ikoyi', 'Ajah',
-                'Ikeja', 'Yaba', 'Surulere', 'Maryland', 'Magodo', 'Lagos',
-                'Nigeria', 'VI', 'VGC', 'Osapa', 'Sangotedo'
-            ]
-
-            title_is_generic = title.strip() in generic_location_names
-
-            # Heuristic 3: Missing critical fields
-            missing_price = not price or price == 0
-            missing_details = not extracted_data.get('bedrooms') and not extracted_data.get('bathrooms')
-
-            # Heuristic 4: Very short title
-            title_too_short = len(title) < 10
-
-            # Decision logic
-            category_score = 0
-
-            if url_is_category:
-                category_score += 3
-            if title_is_generic:
-                category_score += 2
-            if missing_price:
-                category_score += 2
-            if missing_details:
-                category_score += 1
-            if title_too_short:
-                category_score += 1
+            if scores is not None:
+                category_score = scores[i - 1]
+                signals = flagged.get(i - 1)
+            else:
+                signals = _category_signals(prop)
+                category_score = signals['category_score']
+            basic_info = prop.get('basic_info') or _EMPTY
+            title = basic_info.get('title') or ''
 
             # Threshold: Category if score >= 4
-            is_cat = category_score >= 4
-
-            # Store detection info
-            detection_info = {
-                'url_is_category': url_is_category,
-                'title_is_generic': title_is_generic,
-                'missing_price': missing_price,
-                'missing_details': missing_details,
-                'title_too_short': title_too_short,
-                'category_score': category_score,
-                'threshold': 4
-            }
-
-            if is_cat:
-                prop['_detection_info'] = detection_info
+            if category_score >= 4:
+                prop['_detection_info'] = dict(signals, threshold=4)
                 category_pages.append(prop)
-                logger.debug(f"[{i}/{len(properties)}] CATEGORY: {title[:50]} (score: {category_score}, url: {url[:60]}...)")
+                logger.debug(f"[{i}/{len(properties)}] CATEGORY: {title[:50]} (score: {category_score}, url: {(basic_info.get('url') or '')[:60]}...)")
             else:
                 valid_properties.append(prop)
                 logger.debug(f"[{i}/{len(properties)}] VALID: {title[:50]} (score: {category_score})")
@@ -153,15 +266,56 @@ def identify_category_pages(properties: List[Dict]) -> Tuple[List[Dict], List[Di
     return category_pages, valid_properties
 
 
+def fetch_full_documents(db, properties: List[Dict]) -> List[Dict]:
+    """
+    Re-read complete documents for properties fetched with a projection.
+
+    Used before exporting so the backup holds every field, not just
+    DETECTION_FIELDS. Detection info is carried over to the full copies.
+
+    Args:
+        db: Firestore client
+        properties: Projected property dicts (need metadata.hash)
+
+    Returns:
+        List of full property dictionaries
+    """
+    properties_ref = db.collection('properties')
+    by_id = {}
+    for prop in properties:
+        doc_id = (prop.get('metadata') or _EMPTY).get('hash')
+        if doc_id:
+            by_id[doc_id] = prop
+
+    doc_ids = list(by_id)
+    full_properties = []
+    for start in range(0, len(doc_ids), STREAM_PAGE_SIZE):
+        refs = [properties_ref.document(doc_id) for doc_id in doc_ids[start:start + STREAM_PAGE_SIZE]]
+        for snapshot in db.get_all(refs):
+            if not snapshot.exists:
+                continue
+            full = _clean_property_dict(snapshot.to_dict())
+            full['_detection_info'] = by_id[snapshot.id].get('_detection_info')
+            full_properties.append(full)
+
+    return full_properties
+
+
 def export_to_json(properties: List[Dict], filename: str):
-    """Export properties to JSON file for backup."""
+    """
+    Export properties to a JSON Lines file for backup.
+
+    Each property is written as one compact JSON object per line as it is
+    serialized, so the backup never holds a second full copy in memory.
+    """
     try:
         # Create exports directory if it doesn't exist
         os.makedirs('exports', exist_ok=True)
         filepath = os.path.join('exports', filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(properties, f, indent=2, ensure_ascii=False, default=str)
+        with open(filepath, 'wb') as f:
+            for prop in properties:
+                f.write(_dumps_line(prop))
 
         logger.info(f"Exported {len(properties)} properties to {filepath}")
         return filepath
@@ -171,13 +325,52 @@ def export_to_json(properties: List[Dict], filename: str):
         return None
 
 
-def delete_category_pages(category_pages: List[Dict], dry_run: bool = True) -> int:
+def _commit_delete_batch(db, properties_ref, doc_ids: List[str], max_retries: int = 3) -> bool:
+    """
+    Delete documents in a single Firestore WriteBatch with retry.
+
+    Args:
+        db: Firestore client
+        properties_ref: Reference to the properties collection
+        doc_ids: Document IDs to delete (at most 500, the Firestore batch limit)
+        max_retries: Maximum commit attempts
+
+    Returns:
+        True if the batch committed, False otherwise
+    """
+    for attempt in range(1, max_retries + 1):
+        batch = db.batch()
+        for doc_id in doc_ids:
+            batch.delete(properties_ref.document(doc_id))
+
+        try:
+            batch.commit()
+            return True
+        except (Aborted, DeadlineExceeded, ServiceUnavailable) as e:
+            if attempt >= max_retries:
+                logger.error(f"Delete batch of {len(doc_ids)} failed after {max_retries} attempts: {e}")
+                return False
+
+            # Exponential backoff: 1s, 2s, 4s
+            wait_time = 2 ** (attempt - 1)
+            logger.warning(f"Delete batch failed (attempt {attempt}/{max_retries}), retrying in {wait_time}s: {e}")
+            time.sleep(wait_time)
+        except Exception as e:
+            logger.error(f"Error deleting batch of {len(doc_ids)} properties: {e}")
+            return False
+
+    return False
+
+
+def delete_category_pages(category_pages: List[Dict], dry_run: bool = True,
+                          workers: int = DELETE_WORKERS) -> int:
     """
     Delete category pages from Firestore.
 
     Args:
         category_pages: List of category page dictionaries
         dry_run: If True, don't actually delete (just show what would be deleted)
+        workers: Number of batch commits to run concurrently
 
     Returns:
         Number of properties deleted
@@ -203,27 +396,35 @@ def delete_category_pages(category_pages: List[Dict], dry_run: bool = True) -> i
     else:
         logger.info(f"DELETING {len(category_pages)} category pages from Firestore...")
 
-        for i, prop in enumerate(category_pages, 1):
-            try:
-                # Get property hash (used as document ID)
-                prop_hash = prop.get('metadata', {}).get('hash', '')
+        db = _get_firestore_client()
+        if db is None:
+            logger.error("Firestore not available")
+            return 0
 
-                if not prop_hash:
-                    logger.warning(f"Property {i} has no hash, skipping")
-                    continue
+        properties_ref = db.collection('properties')
 
-                title = prop.get('basic_info', {}).get('title', 'No title')
-
-                # Delete from Firestore
-                db = _get_firestore_client()
-                doc_ref = db.collection('properties').document(prop_hash)
-                doc_ref.delete()
-                deleted_count += 1
-
-                logger.info(f"[{i}/{len(category_pages)}] Deleted: {title[:60]} (hash: {prop_hash})")
-
-            except Exception as e:
-                logger.error(f"Error deleting property {i}: {e}")
+        # Collect document IDs (property hash) up front
+        doc_ids = []
+        for i, prop in enumerate(category_pages, 1):
+            prop_hash = (prop.get('metadata') or _EMPTY).get('hash', '')
+            if not prop_hash:
+                logger.warning(f"Property {i} has no hash, skipping")
+                continue
+            doc_ids.append(prop_hash)
+
+        # One commit per DELETE_BATCH_SIZE deletes instead of one RPC per
+        # document; commits are network-bound, so run them concurrently
+        chunks = [doc_ids[start:start + DELETE_BATCH_SIZE]
+                  for start in range(0, len(doc_ids), DELETE_BATCH_SIZE)]
+        workers = max(1, min(workers, len(chunks)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="delete") as executor:
+            futures = {executor.submit(_commit_delete_batch, db, properties_ref, chunk): chunk
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                if future.result():
+                    deleted_count += len(futures[future])
+                    logger.info(f"Deleted {deleted_count}/{len(doc_ids)} category pages")
 
         logger.info(f"Deletion complete: {deleted_count} properties deleted")
         return deleted_count
@@ -251,7 +452,7 @@ def main():
         '--export',
         type=str,
         metavar='FILENAME',
-        help='Export category pages to JSON before deleting'
+        help='Export category pages to a JSON Lines file (one property per line) before deleting'
     )
 
     parser.add_argument(
@@ -261,6 +462,13 @@ def main():
         help='Minimum category score to delete (default: 4)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DELETE_WORKERS,
+        help=f'Concurrent delete batch commits (default: {DELETE_WORKERS})'
+    )
+
     args = parser.parse_args()
 
     # Validate arguments
@@ -283,7 +491,12 @@ def main():
     # Step 1: Get all properties from Firestore
     logger.info("\nStep 1: Fetching all properties from Firestore...")
     try:
-        all_properties = get_all_properties()
+        db = _get_firestore_client()
+        if not db:
+            raise RuntimeError("Failed to get Firestore client")
+        properties_query = db.collection('properties').select(DETECTION_FIELDS)
+        all_properties = [_clean_property_dict(doc.to_dict())
+                          for doc in stream_in_pages(properties_query)]
         logger.info(f"Retrieved {len(all_properties)} properties")
     except Exception as e:
         logger.error(f"Failed to fetch properties: {e}")
@@ -309,11 +522,11 @@ def main():
     # Step 3: Export if requested
     if args.export:
         logger.info(f"\nStep 3: Exporting category pages to {args.export}...")
-        export_to_json(category_pages, args.export)
+        export_to_json(fetch_full_documents(db, category_pages), args.export)
 
     # Step 4: Delete (or show what would be deleted)
     logger.info(f"\nStep 4: {'Deleting' if args.delete else 'Showing'} category pages...")
-    deleted_count = delete_category_pages(category_pages, dry_run=args.dry_run)
+    deleted_count = delete_category_pages(category_pages, dry_run=args.dry_run, workers=args.workers)
 
     # Summary
     logger.info("\n" + "="*70)
@@ -327,7 +540,7 @@ def main():
 
     if args.dry_run:
         logger.info("\nThis was a DRY RUN. To actually delete, run with --delete flag:")
-        logger.info(f"  python scripts/cleanup_category_pages.py --delete --export category_backup.json")
+        logger.info(f"  python scripts/cleanup_category_pages.py --delete --export category_backup.jsonl")
 
 
 if __name__ == '__main__':
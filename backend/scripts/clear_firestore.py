@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from core.firestore_enterprise import _get_firestore_client
+from core.firestore_queries_enterprise import STREAM_PAGE_SIZE, stream_in_pages
 
 def clear_firestore():
     """Delete all documents from properties collection."""
@@ -20,30 +21,31 @@ def clear_firestore():
     # Get properties collection
     properties_ref = db.collection('properties')
 
-    # Get all documents
-    print("[INFO] Fetching all documents...")
-    docs = list(properties_ref.stream())
-
-    if not docs:
-        print("[INFO] No documents to delete. Firestore is already empty.")
-        return True
-
-    print(f"[INFO] Found {len(docs)} documents to delete")
-
-    # Delete in batches of 500 (Firestore limit)
-    batch_size = 500
+    # Page through document IDs only (no field data) and delete as we go;
+    # one batch per page stays within the 500-write batch limit
+    print("[INFO] Deleting documents page by page...")
     deleted_count = 0
+    batch = db.batch()
+    pending = 0
 
-    for i in range(0, len(docs), batch_size):
-        batch = db.batch()
-        batch_docs = docs[i:i + batch_size]
+    for doc in stream_in_pages(properties_ref.select([])):
+        batch.delete(doc.reference)
+        pending += 1
 
-        for doc in batch_docs:
-            batch.delete(doc.reference)
+        if pending == STREAM_PAGE_SIZE:
+            batch.commit()
+            deleted_count += pending
+            print(f"[INFO] Deleted {deleted_count} documents...")
+            batch = db.batch()
+            pending = 0
 
+    if pending:
         batch.commit()
-        deleted_count += len(batch_docs)
-        print(f"[INFO] Deleted {deleted_count}/{len(docs)} documents...")
+        deleted_count += pending
+
+    if not deleted_count:
+        print("[INFO] No documents to delete. Firestore is already empty.")
+        return True
 
     print(f"[SUCCESS] Deleted {deleted_count} documents from Firestore!")
     return True
@@ -22,7 +22,7 @@ import sys
 import argparse
 import logging
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
 
@@ -90,19 +90,20 @@ def load_all_properties(firestore_client: FirestoreEnterpriseClient) -> List[Dic
         return []
 
 
-def preview_enhancements(properties: List[Dict]) -> Dict[str, Any]:
+def preview_enhancements(properties: List[Dict], max_workers: Optional[int] = 1) -> Dict[str, Any]:
     """
     Preview what enhancements would be made without applying them.
 
     Args:
         properties: List of property dictionaries
+        max_workers: Worker processes for batch enhancement (None = CPU count)
 
     Returns:
         Dictionary with preview statistics
     """
     logger.info("Previewing enhancements...")
 
-    results = batch_enhance_properties(properties, validate_only=False)
+    results = batch_enhance_properties(properties, validate_only=False, max_workers=max_workers)
 
     # Print summary
     print("\n" + "=" * 80)
@@ -159,7 +160,8 @@ def preview_enhancements(properties: List[Dict]) -> Dict[str, Any]:
 
 def apply_enhancements(firestore_client: FirestoreEnterpriseClient,
                       properties: List[Dict],
-                      delete_category_pages: bool = True) -> Dict[str, Any]:
+                      delete_category_pages: bool = True,
+                      max_workers: Optional[int] = 1) -> Dict[str, Any]:
     """
     Apply enhancements to Firestore database.
 
@@ -167,13 +169,14 @@ def apply_enhancements(firestore_client: FirestoreEnterpriseClient,
         firestore_client: Firestore client instance
         properties: List of property dictionaries
         delete_category_pages: Whether to delete detected category pages
+        max_workers: Worker processes for batch enhancement (None = CPU count)
 
     Returns:
         Dictionary with application statistics
     """
     logger.info("Applying enhancements to Firestore...")
 
-    results = batch_enhance_properties(properties, validate_only=False)
+    results = batch_enhance_properties(properties, validate_only=False, max_workers=max_workers)
 
     stats = {
         'updated': 0,
@@ -292,8 +295,11 @@ def main():
                        help='Keep category pages instead of deleting them')
     parser.add_argument('--report', type=str, default='enhancement_report.json',
                        help='Output report filename')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for enhancement (default: 1, in-process; 0 = CPU count)')
 
     args = parser.parse_args()
+    workers = args.workers or None
 
     # Validate arguments
     if not args.preview and not args.apply:
@@ -326,7 +332,7 @@ def main():
 
     # Execute based on mode
     if args.preview:
-        results = preview_enhancements(properties)
+        results = preview_enhancements(properties, workers)
         generate_report(properties, results, args.report)
 
     elif args.apply:
@@ -341,12 +347,12 @@ def main():
             sys.exit(0)
 
         # First preview
-        results = preview_enhancements(properties)
+        results = preview_enhancements(properties, workers)
         generate_report(properties, results, args.report)
 
         # Then apply
         delete_categories = not args.keep_category_pages
-        apply_stats = apply_enhancements(firestore_client, properties, delete_categories)
+        apply_stats = apply_enhancements(firestore_client, properties, delete_categories, workers)
 
         logger.info("Enhancement complete!")
 
@@ -3,12 +3,23 @@
 Monitor Firestore uploads in real-time
 """
 import os
+import sys
 import time
 from datetime import datetime
 from google.cloud import firestore
 
-# Set Firebase credentials
-os.environ['FIREBASE_SERVICE_ACCOUNT'] = 'realtor-s-practice-firebase-adminsdk-fbsvc-c8563eb2f2.json'
+# Add backend directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.firestore_enterprise import _get_firestore_client
+from core.firestore_queries_enterprise import count_documents, stream_in_pages
+
+# Default Firebase credentials (FIREBASE_SERVICE_ACCOUNT / FIREBASE_CREDENTIALS take precedence)
+if not os.getenv('FIREBASE_CREDENTIALS'):
+    os.environ.setdefault('FIREBASE_SERVICE_ACCOUNT', 'realtor-s-practice-firebase-adminsdk-fbsvc-c8563eb2f2.json')
+
+_BAR = "=" * 80
+
 
 def monitor_firestore(interval=30, duration=None):
     """
@@ -18,22 +29,24 @@ def monitor_firestore(interval=30, duration=None):
         interval: Check every N seconds
         duration: Total monitoring duration in seconds (None = infinite)
     """
-    db = firestore.Client.from_service_account_json(
-        os.environ['FIREBASE_SERVICE_ACCOUNT']
-    )
+    # Shared Firebase Admin client (same app and connection as the uploader)
+    db = _get_firestore_client()
+    if db is None:
+        print("[ERROR] Could not connect to Firestore")
+        return
 
     properties_ref = db.collection('properties')
     start_time = time.time()
     last_count = 0
     last_check_time = datetime.now()
 
-    print("=" * 80)
+    print(_BAR)
     print("FIRESTORE MONITORING - Real-time Property Upload Tracking")
-    print("=" * 80)
+    print(_BAR)
     print(f"Collection: properties")
     print(f"Check interval: {interval} seconds")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
+    print(_BAR)
     print()
 
     try:
@@ -44,7 +57,7 @@ def monitor_firestore(interval=30, duration=None):
                 break
 
             # Get current count
-            current_count = len(list(properties_ref.select([]).stream()))
+            current_count = count_documents(properties_ref)
             current_time = datetime.now()
             elapsed = (current_time - last_check_time).total_seconds()
 
@@ -91,25 +104,28 @@ def monitor_firestore(interval=30, duration=None):
         print("\n\nMonitoring stopped by user")
 
     # Final summary
-    print("\n" + "=" * 80)
+    print("\n" + _BAR)
     print("FINAL SUMMARY")
-    print("=" * 80)
+    print(_BAR)
+
+    # Single streamed pass for both the total and the per-source breakdown,
+    # fetching only the source field instead of whole documents
+    total_count = 0
+    sources = {}
+    for doc in stream_in_pages(properties_ref.select(['basic_info.source'])):
+        total_count += 1
+        source = doc.to_dict().get('basic_info', {}).get('source', 'unknown')
+        sources[source] = sources.get(source, 0) + 1
 
-    total_count = len(list(properties_ref.select([]).stream()))
     print(f"Total properties in Firestore: {total_count}")
 
     # Get breakdown by source
     print("\nBreakdown by source:")
-    sources = {}
-    for doc in properties_ref.stream():
-        data = doc.to_dict()
-        source = data.get('basic_info', {}).get('source', 'unknown')
-        sources[source] = sources.get(source, 0) + 1
 
     for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
         print(f"  {source}: {count} properties")
 
-    print("\n" + "=" * 80)
+    print("\n" + _BAR)
 
 if __name__ == "__main__":
     import argparse
@@ -131,8 +131,8 @@ def update_site_metadata_aggregates():
         return False
 
     try:
-        # Get all unique sites
-        properties = db.collection('properties').stream()
+        # Get all unique sites (only the site_key field is transferred)
+        properties = db.collection('properties').select(['site_key']).stream()
         sites = set()
 
         for doc in properties:
@@ -106,14 +106,12 @@ def verify_upload(db, minutes_threshold: int = 15):
 
         # Check 2: Count total documents
         print("\n[Check 2] Counting total documents...")
-        # For accurate count, we need to iterate (Firestore doesn't have direct count)
-        # Limit to 10000 for performance
-        total_count = 0
-        docs_iterator = collection_ref.limit(10000).stream()
-        for doc in docs_iterator:
-            total_count += 1
-            if total_count % 1000 == 0:
-                print(f"  Counted {total_count} documents...")
+        # Server-side count() aggregation: transfers only the total
+        try:
+            total_count = int(collection_ref.count().get()[0][0].value)
+        except AttributeError:
+            # Older google-cloud-firestore without aggregation queries
+            total_count = sum(1 for _ in collection_ref.select([]).limit(10000).stream())
 
         print(f"  [PASS] Total documents: {total_count}")
 
@@ -131,9 +129,13 @@ def verify_upload(db, minutes_threshold: int = 15):
 
         # Get sample of recent documents (limit 100 for performance)
         sample_docs = list(collection_ref.limit(100).stream())
+        # Converted once here; Check 4 reuses the first document's data
+        sample_data = None
 
         for doc in sample_docs:
             doc_data = doc.to_dict()
+            if sample_data is None:
+                sample_data = doc_data
 
             # Check various timestamp fields
             uploaded_at = doc_data.get('uploaded_at')
@@ -176,8 +178,6 @@ def verify_upload(db, minutes_threshold: int = 15):
 
         # Check 4: Verify document structure
         print("\n[Check 4] Verifying document structure...")
-        sample_doc = sample_docs[0]
-        sample_data = sample_doc.to_dict()
 
         # Check for enterprise schema categories
         required_categories = ['basic_info', 'property_details', 'financial', 'location', 'metadata']
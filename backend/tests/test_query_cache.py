@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Query Cache
+
+Tests result reuse, copying and invalidation of the Firestore query cache.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import query_cache
+from core.query_cache import cached_query, invalidate_query_cache
+
+
+def _counting_query(result):
+    """Cached query returning result and counting real calls"""
+    calls = []
+
+    @cached_query
+    def query(limit=10):
+        calls.append(limit)
+        return result
+
+    return query, calls
+
+
+def test_repeat_calls_reuse_result():
+    """Test identical calls within the TTL share one query"""
+    invalidate_query_cache()
+    query, calls = _counting_query([{'price': 5}])
+
+    assert query(limit=5) == [{'price': 5}]
+    assert query(limit=5) == [{'price': 5}]
+    assert calls == [5]
+
+    query(limit=6)
+    assert calls == [5, 6]
+
+    print("[PASS] Repeat calls reuse result")
+
+
+def test_results_are_copies():
+    """Test callers cannot modify the cached result"""
+    invalidate_query_cache()
+    query, calls = _counting_query([{'price': 5}])
+
+    first = query()
+    first[0]['price'] = 0
+
+    assert query() == [{'price': 5}]
+    assert len(calls) == 1
+
+    print("[PASS] Results are copies")
+
+
+def test_empty_results_not_cached():
+    """Test empty results (also returned on errors) are queried again"""
+    invalidate_query_cache()
+    query, calls = _counting_query([])
+
+    query()
+    query()
+    assert len(calls) == 2
+
+    print("[PASS] Empty results not cached")
+
+
+def test_invalidation():
+    """Test invalidate_query_cache forces a fresh query"""
+    invalidate_query_cache()
+    query, calls = _counting_query({'total_properties': 3})
+
+    query()
+    invalidate_query_cache()
+    query()
+    assert len(calls) == 2
+
+    print("[PASS] Invalidation")
+
+
+def test_unhashable_arguments_bypass_cache():
+    """Test calls with unhashable arguments are not cached"""
+    invalidate_query_cache()
+    query, calls = _counting_query([1])
+
+    query(limit=[1])
+    query(limit=[1])
+    assert len(calls) == 2
+
+    print("[PASS] Unhashable arguments bypass cache")
+
+
+def test_disabled_with_zero_ttl():
+    """Test RP_QUERY_CACHE_TTL=0 disables caching"""
+    invalidate_query_cache()
+    query, calls = _counting_query([1])
+
+    original_ttl = query_cache.QUERY_CACHE_TTL
+    query_cache.QUERY_CACHE_TTL = 0
+    try:
+        query()
+        query()
+    finally:
+        query_cache.QUERY_CACHE_TTL = original_ttl
+    assert len(calls) == 2
+
+    print("[PASS] Disabled with zero TTL")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("QUERY CACHE TESTS")
+    print("="*60 + "\n")
+
+    try:
+        test_repeat_calls_reuse_result()
+        test_results_are_copies()
+        test_empty_results_not_cached()
+        test_invalidation()
+        test_unhashable_arguments_bypass_cache()
+        test_disabled_with_zero_ttl()
+
+        print("\n" + "="*60)
+        print("[PASS] ALL TESTS PASSED (6/6)")
+        print("="*60 + "\n")
+        return True
+
+    except AssertionError as e:
+        print(f"\n[FAIL] Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
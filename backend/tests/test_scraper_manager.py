@@ -0,0 +1,252 @@
+"""
+Tests for Scraper Manager Module
+
+Tests batch execution bookkeeping (state, progress, control flags)
+without launching real scraper subprocesses.
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import json
+from pathlib import Path
+from datetime import datetime, timedelta
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.helpers.scraper_manager import ScraperManager
+
+
+class TestScraperManager(unittest.TestCase):
+    """Test ScraperManager batch execution"""
+
+    def setUp(self):
+        """Point state files at a temporary directory"""
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = ScraperManager()
+        self.manager.state_file = Path(self.test_dir) / "scraper_state.json"
+        self.manager.metadata_file = Path(self.test_dir) / "site_metadata.json"
+        self.manager.progress_file = Path(self.test_dir) / "batch_progress.pkl"
+        self.executed = []
+
+        def fake_batch(batch_sites, env):
+            self.executed.append(list(batch_sites))
+            return {'success': True, 'return_code': 0, 'sites': batch_sites}
+
+        self.manager._execute_single_batch = fake_batch
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _make_run(self, sites):
+        state = {
+            'is_running': True,
+            'current_run': {
+                'run_id': 'test_run',
+                'started_at': datetime.now().isoformat(),
+                'sites': sites
+            },
+            'last_run': None
+        }
+        progress_data = {'completed': [], 'failed': [], 'in_progress': []}
+        return state, progress_data
+
+    def test_execute_batches_finalizes_state(self):
+        """A completed run is written to last_run with final stats"""
+        state, progress_data = self._make_run(['site_a', 'site_b'])
+        self.manager._execute_batches([['site_a', 'site_b']], {}, 'test_run',
+                                      state, progress_data)
+
+        self.assertEqual(self.executed, [['site_a', 'site_b']])
+
+        saved = json.loads(self.manager.state_file.read_text())
+        self.assertFalse(saved['is_running'])
+        self.assertIsNone(saved['current_run'])
+        self.assertTrue(saved['last_run']['success'])
+        self.assertEqual(saved['last_run']['final_stats']['successful_sites'], 2)
+        self.assertEqual(saved['last_run']['final_stats']['failed_sites'], 0)
+
+        progress = self.manager._load_progress()
+        self.assertEqual(progress['completed'], ['site_a', 'site_b'])
+        self.assertEqual(progress['in_progress'], [])
+
+    def test_parallel_batches_all_complete(self):
+        """With RP_BATCH_PARALLELISM every batch runs and is counted once"""
+        self.manager.batch_delay_seconds = 0
+        sites = ['site_a', 'site_b', 'site_c', 'site_d', 'site_e']
+        state, progress_data = self._make_run(sites)
+        batches = [['site_a', 'site_b'], ['site_c', 'site_d'], ['site_e']]
+
+        self.manager._execute_batches(batches, {'RP_BATCH_PARALLELISM': '2', 'RP_NO_AUTO_WATCHER': '1'},
+                                      'test_run', state, progress_data)
+
+        self.assertEqual(sorted(self.executed), batches)
+        saved = json.loads(self.manager.state_file.read_text())
+        self.assertEqual(saved['last_run']['final_stats']['successful_sites'], 5)
+        self.assertEqual(self.manager._load_progress()['completed'], sites)
+
+    def test_stop_flag_skips_remaining_batches(self):
+        """A stop request prevents further batches from executing"""
+        state, progress_data = self._make_run(['site_a'])
+        self.manager._stop_event.set()
+        self.manager._execute_batches([['site_a']], {}, 'test_run',
+                                      state, progress_data)
+
+        self.assertEqual(self.executed, [])
+        self.assertFalse(self.manager.state_file.exists())
+
+    def test_paused_run_continues_after_resume(self):
+        """A paused run waits on the pause event and finishes once cleared"""
+        state, progress_data = self._make_run(['site_a'])
+        self.manager._pause_event.set()
+        threading.Timer(0.2, self.manager._pause_event.clear).start()
+
+        self.manager._execute_batches([['site_a']], {}, 'test_run',
+                                      state, progress_data)
+
+        saved = json.loads(self.manager.state_file.read_text())
+        self.assertTrue(saved['last_run']['success'])
+
+    def _other_worker(self):
+        """A second manager sharing the state files, as in another API worker"""
+        other = ScraperManager()
+        other.state_file = self.manager.state_file
+        other.metadata_file = self.manager.metadata_file
+        other.progress_file = self.manager.progress_file
+        return other
+
+    def test_pause_and_resume_from_other_worker(self):
+        """Pause/resume persisted by another process are honoured between batches"""
+        self.manager.batch_delay_seconds = 0
+        state, progress_data = self._make_run(['site_a', 'site_b'])
+        self.manager._save_state(state)
+        other = self._other_worker()
+
+        def fake_batch(batch_sites, env):
+            self.executed.append(list(batch_sites))
+            if len(self.executed) == 1:
+                self.assertTrue(other.pause_scrape()['success'])
+                threading.Timer(0.2, other.resume_scrape).start()
+            return {'success': True, 'return_code': 0, 'sites': batch_sites}
+
+        self.manager._execute_single_batch = fake_batch
+        self.manager._execute_batches([['site_a'], ['site_b']], {}, 'test_run',
+                                      state, progress_data)
+
+        self.assertEqual(self.executed, [['site_a'], ['site_b']])
+        saved = json.loads(self.manager.state_file.read_text())
+        self.assertTrue(saved['last_run']['success'])
+        self.assertFalse(saved['last_run']['paused'])
+        self.assertIn('paused_at', saved['last_run'])
+        self.assertIn('resumed_at', saved['last_run'])
+
+    def test_stop_from_other_worker(self):
+        """A stop persisted by another process ends the run without overwriting it"""
+        self.manager.batch_delay_seconds = 0
+        state, progress_data = self._make_run(['site_a', 'site_b'])
+        self.manager._save_state(state)
+        other = self._other_worker()
+
+        def fake_batch(batch_sites, env):
+            self.executed.append(list(batch_sites))
+            self.assertTrue(other.stop_scrape()['success'])
+            return {'success': True, 'return_code': 0, 'sites': batch_sites}
+
+        self.manager._execute_single_batch = fake_batch
+        self.manager._execute_batches([['site_a'], ['site_b']], {}, 'test_run',
+                                      state, progress_data)
+
+        self.assertEqual(self.executed, [['site_a']])
+        saved = json.loads(self.manager.state_file.read_text())
+        self.assertFalse(saved['is_running'])
+        self.assertTrue(saved['last_run']['stopped_manually'])
+
+    def test_load_state_cache_returns_independent_copies(self):
+        """Cached state loads can be mutated without affecting later loads"""
+        self.manager._save_state({'is_running': True, 'current_run': {'paused': False}, 'last_run': None})
+
+        first = self.manager._load_state()
+        first['current_run']['paused'] = True
+        second = self.manager._load_state()
+
+        self.assertFalse(second['current_run']['paused'])
+
+    def test_filter_fresh_sites_skips_within_ttl(self):
+        """Sites scraped within their TTL are skipped, others kept"""
+        now = datetime.now()
+        self.manager.metadata_file.write_text(json.dumps({
+            'fresh_site': {'last_successful_scrape': (now - timedelta(minutes=5)).isoformat()},
+            'stale_site': {'last_successful_scrape': (now - timedelta(hours=5)).isoformat()}
+        }))
+        config_data = {'sites': {
+            'fresh_site': {'metadata': {'ttl_seconds': 3600}},
+            'stale_site': {'metadata': {'ttl_seconds': 3600}},
+            'new_site': {'metadata': {'ttl_seconds': 3600}},
+            'no_ttl_site': {}
+        }}
+
+        to_scrape, skipped = self.manager._filter_fresh_sites(
+            ['fresh_site', 'stale_site', 'new_site', 'no_ttl_site'], config_data)
+
+        self.assertEqual(to_scrape, ['stale_site', 'new_site', 'no_ttl_site'])
+        self.assertEqual(skipped, ['fresh_site'])
+
+    def test_ttl_only_applies_to_all_enabled_sites(self):
+        """Explicitly requested sites are scraped even within their TTL"""
+        self.manager.metadata_file.write_text(json.dumps({
+            'fresh_site': {'last_successful_scrape': datetime.now().isoformat()}
+        }))
+        config_data = {'sites': {'fresh_site': {'enabled': True, 'metadata': {'ttl_seconds': 3600}}}}
+
+        class FakeConfigManager:
+            def _load_yaml_cached(self):
+                return config_data
+
+        self.manager._config_manager = FakeConfigManager()
+        self.manager._execute_batches = lambda *args: None
+
+        result = self.manager.start_scrape()
+        self.assertFalse(result['success'])
+        self.assertEqual(result['skipped'], ['fresh_site'])
+
+        result = self.manager.start_scrape(sites=['fresh_site'])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['current_run']['sites'], ['fresh_site'])
+        self.assertEqual(result['current_run']['skipped'], [])
+
+    def test_get_history_returns_newest_first(self):
+        """History is limited to the newest entries and reports the full total"""
+        self.manager.metadata_file.write_text(json.dumps({
+            f'site_{i}': {'last_successful_scrape': f'2025-01-{i + 1:02d}T10:00:00', 'last_count': i}
+            for i in range(5)
+        }))
+
+        history = self.manager.get_history(limit=2)
+
+        self.assertEqual(history['total'], 5)
+        self.assertEqual([h['sites'] for h in history['scrapes']], [['site_4'], ['site_3']])
+        self.assertEqual(self.manager.get_history(limit=2), history)
+
+    def test_calculate_eta_uses_recent_rate(self):
+        """ETA follows the recent sample window rather than the run average"""
+        self.manager._eta_buffer.extend([(100.0, 10), (110.0, 20)])
+
+        eta = self.manager._calculate_eta(20, 30, elapsed_seconds=400)
+
+        self.assertEqual(eta['average_seconds_per_site'], 1.0)
+        self.assertEqual(eta['estimated_remaining_seconds'], 10)
+
+    def test_calculate_eta_falls_back_to_average(self):
+        """Without enough samples the cumulative average is used"""
+        eta = self.manager._calculate_eta(10, 20, elapsed_seconds=100)
+
+        self.assertEqual(eta['average_seconds_per_site'], 10.0)
+        self.assertEqual(eta['estimated_remaining_seconds'], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
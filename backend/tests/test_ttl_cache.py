@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test TTL Cache
+
+Tests expiry, size capping, selective discard and generations of the
+shared in-process TTL cache.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ttl_cache import TTLCache
+
+
+def test_get_and_expiry():
+    """Test entries expire after the TTL and never past expires_at"""
+    cache = TTLCache(ttl=60, max_size=10)
+
+    cache.put('a', 1)
+    cache.put('b', 2, expires_at=time.time() - 1)
+    cache.put('c', 3, expires_at=time.time() + 3600)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.get('missing') is None
+
+    print("[PASS] Get and expiry")
+
+
+def test_full_cache_drops_expired_first():
+    """Test a full cache drops expired entries before clearing everything"""
+    cache = TTLCache(ttl=60, max_size=2)
+
+    cache.put('stale', 1, expires_at=time.time() - 1)
+    cache.put('fresh', 2)
+    cache.put('new', 3)
+    assert cache.get('fresh') == 2
+    assert cache.get('new') == 3
+
+    cache.put('overflow', 4)
+    assert len(cache) == 1
+    assert cache.get('overflow') == 4
+
+    print("[PASS] Full cache drops expired first")
+
+
+def test_discard_if():
+    """Test discard_if removes only matching entries"""
+    cache = TTLCache(ttl=60, max_size=10)
+    user = {'uid': 'u1'}
+    cache.put(('uid', 'u1'), user)
+    cache.put(('email', 'a@b.co'), user)
+    cache.put(('uid', 'u2'), {'uid': 'u2'})
+
+    cache.discard_if(lambda key, value: value['uid'] == 'u1')
+
+    assert cache.get(('uid', 'u1')) is None
+    assert cache.get(('email', 'a@b.co')) is None
+    assert cache.get(('uid', 'u2')) == {'uid': 'u2'}
+
+    print("[PASS] Discard if")
+
+
+def test_clear_drops_older_generation_puts():
+    """Test puts for a generation read before clear() are dropped"""
+    cache = TTLCache(ttl=60, max_size=10)
+    generation = cache.generation
+
+    cache.clear()
+    cache.put('a', 1, generation=generation)
+    assert cache.get('a') is None
+
+    cache.put('a', 1, generation=cache.generation)
+    assert cache.get('a') == 1
+
+    print("[PASS] Clear drops older generation puts")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("TTL CACHE TESTS")
+    print("="*60 + "\n")
+
+    try:
+        test_get_and_expiry()
+        test_full_cache_drops_expired_first()
+        test_discard_if()
+        test_clear_drops_older_generation_puts()
+
+        print("\n" + "="*60)
+        print("[PASS] ALL TESTS PASSED (4/4)")
+        print("="*60 + "\n")
+        return True
+
+    except AssertionError as e:
+        print(f"\n[FAIL] Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)